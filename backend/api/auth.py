@@ -1,40 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from core.auth import (
-    authenticate_user, create_access_token, get_password_hash,
+    authenticate_user, create_access_token, get_password_hash, verify_password,
     get_user_by_email, get_user_by_username, get_current_user,
+    revoke_token, security, verify_token,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from core.rate_limit import login_rate_limit, register_rate_limit, password_reset_rate_limit
 from db.database import get_db
-from db.auth_models import User, PatientProfile
+from db.auth_models import User, PatientProfile, UserRole
 from schemas.auth_schemas import (
-    UserCreate, UserLogin, Token, User as UserSchema, SocialAuth,
+    UserCreate, UserLogin, Token, TokenData, User as UserSchema, SocialAuth,
     ForgotPassword, ResetPassword
 )
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
-@router.post("/register", response_model=UserSchema)
+@router.post("/register", response_model=UserSchema, dependencies=[Depends(register_rate_limit)])
 def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     
-    # Check if email already exists
-    if get_user_by_email(db, user_data.email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    # Check if username already exists
-    if get_user_by_username(db, user_data.username):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
-        )
-    
-    # Create new user
+    # Hash before touching the database so no connection is held during Argon2
     hashed_password = get_password_hash(user_data.password)
     db_user = User(
         email=user_data.email,
@@ -43,9 +33,19 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         role=user_data.role
     )
     
+    # The unique indexes on email/username decide duplicates in the INSERT
+    # itself: no pre-check SELECTs, and no race between check and insert
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        # flush assigns db_user.id so the profile joins the same transaction
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        if get_user_by_email(db, user_data.email):
+            detail = "Email already registered"
+        else:
+            detail = "Username already taken"
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
     
     # Create patient profile if role is patient
     if user_data.role == "patient":
@@ -56,11 +56,12 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             phone=user_data.phone
         )
         db.add(patient_profile)
-        db.commit()
+    
+    db.commit()
     
     return db_user
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(login_rate_limit)])
 def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login user and return JWT token"""
     
@@ -74,7 +75,7 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email},
+        data={"sub": user.email, "role": user.role.value},
         expires_delta=access_token_expires
     )
     
@@ -99,8 +100,8 @@ def change_password(
 ):
     """Change user password"""
     
-    # Verify current password
-    if not authenticate_user(db, current_user.email, current_password):
+    # Verify current password against the already-loaded user (no re-fetch)
+    if not verify_password(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -113,8 +114,12 @@ def change_password(
     return {"message": "Password updated successfully"}
 
 @router.post("/logout")
-def logout():
-    """Logout user (client should remove token)"""
+def logout(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token_data: TokenData = Depends(verify_token)
+):
+    """Logout user and revoke the current token"""
+    revoke_token(credentials.credentials, token_data)
     return {"message": "Successfully logged out"}
 
 @router.delete("/delete-account")
@@ -126,7 +131,7 @@ def delete_account(
     """Delete user account"""
     
     # Verify password before deletion
-    if not authenticate_user(db, current_user.email, password):
+    if not verify_password(password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password is incorrect"
@@ -160,13 +165,12 @@ def social_auth(auth_data: SocialAuth, db: Session = Depends(get_db)):
             email=auth_data.email,
             username=username,
             hashed_password="",  # No password for social auth
-            role="patient",
+            role=UserRole.PATIENT,
             is_verified=True  # Social accounts are pre-verified
         )
         
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        db.flush()
         
         # Create patient profile
         names = auth_data.name.split(' ', 1)
@@ -185,7 +189,7 @@ def social_auth(auth_data: SocialAuth, db: Session = Depends(get_db)):
     # Generate access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email},
+        data={"sub": user.email, "role": user.role.value},
         expires_delta=access_token_expires
     )
     
@@ -196,22 +200,20 @@ def social_auth(auth_data: SocialAuth, db: Session = Depends(get_db)):
         role=user.role.value
     )
 
-@router.post("/forgot-password")
-def forgot_password(request: ForgotPassword, db: Session = Depends(get_db)):
+_FORGOT_PASSWORD_RESPONSE = {"message": "If the email exists, a password reset link has been sent."}
+
+@router.post("/forgot-password", dependencies=[Depends(password_reset_rate_limit)])
+def forgot_password(request: ForgotPassword):
     """Send password reset email"""
     
-    user = get_user_by_email(db, request.email)
-    if not user:
-        # Don't reveal if email exists or not
-        return {"message": "If the email exists, a password reset link has been sent."}
-    
     # In a real implementation, you would:
-    # 1. Generate a secure reset token
+    # 1. Look up the user and generate a secure reset token
     # 2. Store it with expiration in database
     # 3. Send email with reset link
     
-    # For now, just return success message
-    return {"message": "If the email exists, a password reset link has been sent."}
+    # Until then there is nothing to do per user, so skip the lookup; the
+    # response is identical either way and doesn't reveal if the email exists
+    return _FORGOT_PASSWORD_RESPONSE
 
 @router.post("/reset-password")
 def reset_password(request: ResetPassword, db: Session = Depends(get_db)):
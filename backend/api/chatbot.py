@@ -36,19 +36,20 @@ async def chat_with_assistant(request: ChatRequest):
     3. Provide genomics-specific advice and explanations
     """
     try:
-        logger.info(f"Chat request from user {request.user_id}: {request.message[:50]}...")
+        logger.info("Chat request from user %s: %s...", request.user_id, request.message[:50])
+        
+        # Load the user's context once; it feeds both the prompt and context_used
+        user_context = await llm_service.get_user_context(request.user_id)
+        context_used = bool(user_context.get("prs_scores") or user_context.get("genomic_variants"))
         
         # Generate response using LLM service
         response = await llm_service.generate_response(
             user_id=request.user_id,
-            message=request.message
+            message=request.message,
+            user_context=user_context
         )
         
-        # Get user context to determine if real data was used
-        user_context = await llm_service.get_user_context(request.user_id)
-        context_used = bool(user_context.get("prs_scores") or user_context.get("genomic_variants"))
-        
-        logger.info(f"Generated response for user {request.user_id} (context_used: {context_used})")
+        logger.info("Generated response for user %s (context_used: %s)", request.user_id, context_used)
         
         return ChatResponse(
             response=response,
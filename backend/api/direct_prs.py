@@ -1,21 +1,71 @@
 import sqlite3
 import json
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+import orjson
+import hashlib
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+
+from core.redis_client import get_redis, mark_redis_unavailable, redis
 
 router = APIRouter(prefix="/api/direct", tags=["direct"])
 
+# Cached latest-PRS payloads; the key embeds the user's newest score id and
+# score count, so new or deleted scores move readers to a fresh key
+PRS_CACHE_TTL_SECONDS = 3600
+
 def get_database_connection():
     """Get direct SQLite connection"""
     return sqlite3.connect('curagenie.db')
 
-@router.get("/prs/user/{user_id}")
-def get_user_prs_scores_direct(user_id: str) -> List[Dict[str, Any]]:
+class DirectPrsScore(BaseModel):
+    id: int
+    genomic_data_id: int
+    disease_type: str
+    score: float
+    calculated_at: Optional[str] = None
+    filename: Optional[str] = None
+    genomic_status: Optional[str] = None
+    uploaded_at: Optional[str] = None
+
+# The body is pre-serialized bytes, so response_model only documents the shape
+@router.get(
+    "/prs/user/{user_id}",
+    response_model=List[DirectPrsScore],
+    responses={304: {"description": "Scores unchanged since the ETag in If-None-Match"}},
+)
+def get_user_prs_scores_direct(user_id: str, request: Request) -> Response:
     """Get PRS scores for a user using direct SQL query"""
+    conn = None
     try:
         conn = get_database_connection()
         cursor = conn.cursor()
         
+        cursor.execute("""
+        SELECT MAX(ps.id), COUNT(*)
+        FROM prs_scores ps
+        JOIN genomic_data gd ON ps.genomic_data_id = gd.id
+        WHERE gd.user_id = ?
+        """, (user_id,))
+        latest_id, score_count = cursor.fetchone()
+        cache_key = f"prs:{user_id}:v{latest_id}:{score_count}"
+        
+        # Same version means the same body, so clients revalidate with a 304
+        etag = '"' + hashlib.blake2b(cache_key.encode(), digest_size=8).hexdigest() + '"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+        
+        client = get_redis()
+        if client is not None:
+            try:
+                cached = client.get(cache_key)
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+                cached = None
+            if cached is not None:
+                return Response(content=cached, media_type="application/json", headers=cache_headers)
+        
         # Direct SQL query to get LATEST PRS scores for each disease (avoid duplicates)
         query = """
         SELECT 
@@ -57,11 +107,19 @@ def get_user_prs_scores_direct(user_id: str) -> List[Dict[str, Any]]:
                 "uploaded_at": row[7]
             })
         
-        conn.close()
-        return results
+        body = orjson.dumps(results)
+        if client is not None:
+            try:
+                client.setex(cache_key, PRS_CACHE_TTL_SECONDS, body)
+            except redis.RedisError as e:
+                mark_redis_unavailable(e)
+        return Response(content=body, media_type="application/json", headers=cache_headers)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    finally:
+        if conn is not None:
+            conn.close()
 
 @router.get("/genomic-data/user/{user_id}")
 def get_user_genomic_data_direct(user_id: str) -> List[Dict[str, Any]]:
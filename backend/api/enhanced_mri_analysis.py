@@ -27,6 +27,9 @@ from schemas.schemas import MRIAnalysisResponse, MRIUploadResponse
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/enhanced-mri", tags=["enhanced-mri-analysis"])
 
+# Accepted MRI image formats
+ALLOWED_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.tif', '.dcm', '.dicom')
+
 # Create MRI uploads directory if it doesn't exist
 MRI_UPLOAD_DIR = "uploads/mri"
 os.makedirs(MRI_UPLOAD_DIR, exist_ok=True)
@@ -516,11 +519,10 @@ async def upload_enhanced_mri_scan(
     """Upload MRI scan for enhanced CNN-based analysis"""
     try:
         # Validate file type
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.tiff', '.tif', '.dcm', '.dicom']
-        if not any(file.filename.lower().endswith(ext) for ext in allowed_extensions):
+        if not file.filename.lower().endswith(ALLOWED_IMAGE_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_IMAGE_EXTENSIONS)}"
             )
         
         # Read file content
@@ -538,7 +540,7 @@ async def upload_enhanced_mri_scan(
         filename = f"enhanced_{file_uuid}_{file.filename}"
         file_path = os.path.join(MRI_UPLOAD_DIR, filename)
         
-        logger.info(f"Starting enhanced MRI upload for user {current_user.id}, file: {file.filename}")
+        logger.info("Starting enhanced MRI upload for user %s, file: %s", current_user.id, file.filename)
         
         # Save file locally
         with open(file_path, "wb") as f:
@@ -572,7 +574,7 @@ async def upload_enhanced_mri_scan(
             file_content
         )
         
-        logger.info(f"Enhanced MRI upload queued for processing: analysis_id: {mri_analysis.id}")
+        logger.info("Enhanced MRI upload queued for processing: analysis_id: %s", mri_analysis.id)
         
         return MRIUploadResponse(
             id=mri_analysis.id,
@@ -1,22 +1,29 @@
 """
 Feedback API endpoints for CuraGenie
 """
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, EmailStr
+from fastapi import APIRouter
+from pydantic import BaseModel, EmailStr, conint, constr
 from typing import Optional
-from datetime import datetime
+from enum import Enum
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/feedback", tags=["feedback"])
 
+class FeedbackType(str, Enum):
+    BUG_REPORT = "bug_report"
+    FEATURE_REQUEST = "feature_request"
+    GENERAL_FEEDBACK = "general_feedback"
+
+# Validation happens at parse time; invalid submissions get a 422
 class FeedbackSubmission(BaseModel):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
-    feedback_type: str  # "bug_report", "feature_request", "general_feedback"
-    message: str
-    rating: Optional[int] = None  # 1-5 stars
+    feedback_type: FeedbackType
+    message: constr(strip_whitespace=True, min_length=10)
+    rating: Optional[conint(ge=1, le=5)] = None  # 1-5 stars
 
 class FeedbackResponse(BaseModel):
     success: bool
@@ -28,55 +35,23 @@ async def submit_feedback(feedback: FeedbackSubmission):
     """
     Submit user feedback for CuraGenie platform
     """
-    try:
-        # Validate feedback type
-        valid_types = ["bug_report", "feature_request", "general_feedback"]
-        if feedback.feedback_type not in valid_types:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid feedback type. Must be one of: {', '.join(valid_types)}"
-            )
-        
-        # Validate rating if provided
-        if feedback.rating is not None and (feedback.rating < 1 or feedback.rating > 5):
-            raise HTTPException(
-                status_code=400,
-                detail="Rating must be between 1 and 5"
-            )
-        
-        # Validate message length
-        if len(feedback.message.strip()) < 10:
-            raise HTTPException(
-                status_code=400,
-                detail="Message must be at least 10 characters long"
-            )
-        
-        # Generate a simple feedback ID (in production, you'd use a proper ID generator)
-        feedback_id = f"FB_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        # Log the feedback (in production, you'd save to database)
-        logger.info(f"Feedback received - ID: {feedback_id}, Type: {feedback.feedback_type}, Rating: {feedback.rating}")
-        logger.info(f"Message: {feedback.message[:100]}...")
-        
-        # Here you would typically:
-        # 1. Save to database
-        # 2. Send email notification to support team
-        # 3. Store in analytics system
-        
-        return FeedbackResponse(
-            success=True,
-            message="Thank you for your feedback! We'll review it and get back to you if needed.",
-            feedback_id=feedback_id
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing feedback: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail="An error occurred while processing your feedback. Please try again."
-        )
+    # Generate a simple feedback ID (in production, you'd use a proper ID generator)
+    feedback_id = f"FB_{time.time_ns() // 1000:x}"
+    
+    # Log the feedback (in production, you'd save to database)
+    logger.info("Feedback received - ID: %s, Type: %s, Rating: %s", feedback_id, feedback.feedback_type.value, feedback.rating)
+    logger.info("Message: %s...", feedback.message[:100])
+    
+    # Here you would typically:
+    # 1. Save to database
+    # 2. Send email notification to support team
+    # 3. Store in analytics system
+    
+    return FeedbackResponse(
+        success=True,
+        message="Thank you for your feedback! We'll review it and get back to you if needed.",
+        feedback_id=feedback_id
+    )
 
 @router.get("/health")
 async def feedback_health():
@@ -1,10 +1,15 @@
+import functools
+import os
 import uuid
 import logging
 import json
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from db.database import get_db
@@ -16,14 +21,27 @@ from cg_worker.tasks import process_genomic_file
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/genomic-data", tags=["genomic-data"])
 
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.aws_access_key_id,
-    aws_secret_access_key=settings.aws_secret_access_key,
-    region_name=settings.aws_region
+# Accepted genomic file types
+ALLOWED_EXTENSIONS = ('.vcf', '.fastq', '.fq', '.vcf.gz', '.fastq.gz')
+
+# Large uploads go up as parallel 8 MiB multipart parts
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
 )
 
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    """Create the S3 client on first use instead of at import time"""
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.aws_region
+    )
+
 @router.post("/upload", response_model=UploadResponse, status_code=202)
 async def upload_genomic_file(
     user_id: str,
@@ -36,34 +54,35 @@ async def upload_genomic_file(
     """
     try:
         # Validate file type
-        allowed_extensions = ['.vcf', '.fastq', '.fq', '.vcf.gz', '.fastq.gz']
-        file_extension = '.' + file.filename.lower().split('.')[-1]
-        if not any(file.filename.lower().endswith(ext.lower()) for ext in allowed_extensions):
+        if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
         # Generate unique file key for S3
         file_uuid = str(uuid.uuid4())
         s3_key = f"users/{user_id}/uploads/{file_uuid}_{file.filename}"
         
-        logger.info(f"Starting upload for user {user_id}, file: {file.filename}")
-        
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
+        logger.info("Starting upload for user %s, file: %s", user_id, file.filename)
         
-        # Upload to S3
+        # Stream the spooled upload straight to S3 instead of reading it into memory
         try:
-            s3_client.put_object(
-                Bucket=settings.s3_bucket_name,
-                Key=s3_key,
-                Body=file_content,
-                ContentType=file.content_type or 'application/octet-stream'
+            # Size the spooled file up front; the stream position after the
+            # transfer is up to s3transfer
+            file.file.seek(0, os.SEEK_END)
+            file_size = file.file.tell()
+            await file.seek(0)
+            await run_in_threadpool(
+                get_s3_client().upload_fileobj,
+                file.file,
+                settings.s3_bucket_name,
+                s3_key,
+                ExtraArgs={"ContentType": file.content_type or 'application/octet-stream'},
+                Config=S3_TRANSFER_CONFIG
             )
-            logger.info(f"Successfully uploaded {file.filename} to S3: {s3_key}")
-        except ClientError as e:
+            logger.info("Successfully uploaded %s to S3: %s", file.filename, s3_key)
+        except (ClientError, S3UploadFailedError) as e:
             logger.error(f"Failed to upload to S3: {e}")
             raise HTTPException(status_code=500, detail="Failed to upload file to storage")
         
@@ -73,20 +92,22 @@ async def upload_genomic_file(
             filename=file.filename,
             file_url=s3_key,  # Store S3 key as file_url
             status="processing",
-            metadata_json=json.dumps({"file_size_bytes": file_size, "uploaded_at": str(uuid.uuid4())})
+            metadata_json=json.dumps({"file_size_bytes": file_size})  # uploaded_at has a server default
         )
         
+        # The INSERT's generated id comes back on flush, so no refresh SELECT after commit
         db.add(genomic_data)
+        db.flush()
+        genomic_data_id = genomic_data.id
         db.commit()
-        db.refresh(genomic_data)
         
         # Queue background processing task
-        process_genomic_file.delay(genomic_data.id)
+        process_genomic_file.delay(genomic_data_id)
         
-        logger.info(f"Queued processing for genomic_data_id: {genomic_data.id}")
+        logger.info("Queued processing for genomic_data_id: %s", genomic_data_id)
         
         return UploadResponse(
-            id=genomic_data.id,
+            id=genomic_data_id,
             message="File uploaded successfully. Processing started.",
             status="processing"
         )
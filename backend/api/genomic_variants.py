@@ -7,7 +7,6 @@ from datetime import datetime
 
 from db.database import get_db
 from db.models import GenomicData, PrsScore
-from genomic_utils import GenomicProcessor
 
 router = APIRouter(prefix="/api/genomic", tags=["genomic-variants"])
 
@@ -25,7 +24,6 @@ def get_genomic_variants(user_id: str, db: Session = Depends(get_db)):
         return []
     
     all_variants = []
-    processor = GenomicProcessor()
     
     for genomic_file in genomic_files:
         try:
@@ -2,45 +2,57 @@ import os
 import uuid
 import logging
 import json
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, BackgroundTasks
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, BackgroundTasks, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
-from typing import List
+from typing import List, Optional
 
 from core.auth import get_current_active_patient
 from db.database import get_db
 from db.models import GenomicData, PrsScore
 from db.auth_models import User
 from schemas.schemas import GenomicDataResponse, UploadResponse
-from services.report_generator import ReportGenerator
-from genomic_utils import GenomicProcessor
+from genomic_utils import get_process_pool, process_genomic_file_at_path
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/local-upload", tags=["local-upload"])
 
+# Accepted genomic file types (a tuple, so endswith checks them in one call)
+ALLOWED_EXTENSIONS = ('.vcf', '.fastq', '.fq', '.vcf.gz', '.fastq.gz')
+
+# Page size when a caller passes `after` without `limit`
+PAGE_SIZE_DEFAULT = 100
+
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Uploads are copied to disk in chunks so request memory stays O(chunk)
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+async def save_upload_to_disk(file: UploadFile, file_path: str) -> int:
+    """Stream an uploaded file to disk and return its size in bytes"""
+    file_size = 0
+    with open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            f.write(chunk)
+            file_size += len(chunk)
+    return file_size
+
 # Background task for processing genomic data
-def process_genomic_data_background(genomic_data_id: int, file_path: str, file_content: bytes, filename: str):
+def process_genomic_data_background(genomic_data_id: int, file_path: str, filename: str):
     """Background task to process genomic data and generate reports"""
     from db.database import SessionLocal  # Import inside function to avoid circular imports
     
     # Create a new database session for this background task
     db = SessionLocal()
     try:
-        logger.info(f"Starting background processing for genomic_data_id: {genomic_data_id}")
+        logger.info("Starting background processing for genomic_data_id: %s", genomic_data_id)
         
-        # Update status to processing and set uploaded_at
-        genomic_record = db.query(GenomicData).filter(GenomicData.id == genomic_data_id).first()
-        if genomic_record:
-            genomic_record.uploaded_at = func.now()
-            db.commit()
-        
-        # Process genomic file for detailed analysis
-        processor = GenomicProcessor()
-        analysis_result = processor.process_genomic_file(file_content, filename)
+        # Parse in a worker process; the file is read there, so only the
+        # path goes over the pipe and this thread just waits on the result
+        analysis_result = get_process_pool().submit(
+            process_genomic_file_at_path, file_path, filename
+        ).result()
         
         # Calculate real PRS scores if VCF file
         prs_scores_data = []
@@ -78,11 +90,12 @@ def process_genomic_data_background(genomic_data_id: int, file_path: str, file_c
             db.add(prs_score)
         
         # Update genomic data status to completed
+        genomic_record = db.query(GenomicData).filter(GenomicData.id == genomic_data_id).first()
         if genomic_record:
             genomic_record.status = "completed"
         
         db.commit()
-        logger.info(f"✅ Successfully processed genomic data and created {len(prs_scores_data)} PRS scores for genomic_data_id: {genomic_data_id}")
+        logger.info("✅ Successfully processed genomic data and created %s PRS scores for genomic_data_id: %s", len(prs_scores_data), genomic_data_id)
         
     except Exception as e:
         logger.error(f"❌ Error in background processing for genomic_data_id {genomic_data_id}: {e}")
@@ -109,11 +122,10 @@ async def upload_genomic_file_authenticated(
     """
     try:
         # Validate file type
-        allowed_extensions = ['.vcf', '.fastq', '.fq', '.vcf.gz', '.fastq.gz']
-        if not any(file.filename.lower().endswith(ext.lower()) for ext in allowed_extensions):
+        if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
         # Generate unique filename
@@ -121,16 +133,12 @@ async def upload_genomic_file_authenticated(
         filename = f"{file_uuid}_{file.filename}"
         file_path = os.path.join(UPLOAD_DIR, filename)
         
-        logger.info(f"Starting authenticated upload for user {current_user.id}, file: {file.filename}")
+        logger.info("Starting authenticated upload for user %s, file: %s", current_user.id, file.filename)
         
         # Save file locally
         try:
-            file_content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(file_content)
-            
-            file_size = len(file_content)
-            logger.info(f"Successfully saved {file.filename} locally: {file_path}")
+            file_size = await save_upload_to_disk(file, file_path)
+            logger.info("Successfully saved %s locally: %s", file.filename, file_path)
         except Exception as e:
             logger.error(f"Failed to save file locally: {e}")
             raise HTTPException(status_code=500, detail="Failed to save file")
@@ -157,11 +165,10 @@ async def upload_genomic_file_authenticated(
             process_genomic_data_background,
             genomic_data.id,
             file_path,
-            file_content,
             file.filename
         )
         
-        logger.info(f"Upload queued for processing: genomic_data_id: {genomic_data.id}")
+        logger.info("Upload queued for processing: genomic_data_id: %s", genomic_data.id)
         
         return UploadResponse(
             id=genomic_data.id,
@@ -176,10 +183,27 @@ async def upload_genomic_file_authenticated(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @router.get("/genomic-data/user/{user_id}", response_model=List[GenomicDataResponse])
-def get_user_genomic_data_local(user_id: str, db: Session = Depends(get_db)):
-    """Get all genomic data records for a user"""
-    genomic_data = db.query(GenomicData).filter(GenomicData.user_id == user_id).all()
-    return genomic_data
+def get_user_genomic_data_local(
+    user_id: str,
+    response: Response,
+    after: Optional[int] = Query(None, description="Return records with id greater than this cursor"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit with `after` to get every record"),
+    db: Session = Depends(get_db)
+):
+    """Get a user's genomic data records, optionally keyset paginated by id"""
+    query = db.query(GenomicData).filter(GenomicData.user_id == user_id)
+    if after is None and limit is None:
+        # Unpaginated callers keep getting the full list
+        return query.order_by(GenomicData.id).all()
+    
+    page_size = limit or PAGE_SIZE_DEFAULT
+    if after is not None:
+        query = query.filter(GenomicData.id > after)
+    records = query.order_by(GenomicData.id).limit(page_size).all()
+    if len(records) == page_size:
+        # A full page may have more behind it; pass this back as `after`
+        response.headers["X-Next-Cursor"] = str(records[-1].id)
+    return records
 
 @router.post("/genomic-data-test", status_code=202)
 async def upload_genomic_file_test(
@@ -191,11 +215,10 @@ async def upload_genomic_file_test(
     """
     try:
         # Validate file type
-        allowed_extensions = ['.vcf', '.fastq', '.fq', '.vcf.gz', '.fastq.gz']
-        if not any(file.filename.lower().endswith(ext.lower()) for ext in allowed_extensions):
+        if not file.filename.lower().endswith(ALLOWED_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
         # Generate unique filename
@@ -203,16 +226,12 @@ async def upload_genomic_file_test(
         filename = f"{file_uuid}_{file.filename}"
         file_path = os.path.join(UPLOAD_DIR, filename)
         
-        logger.info(f"Starting test upload for user {user_id}, file: {file.filename}")
+        logger.info("Starting test upload for user %s, file: %s", user_id, file.filename)
         
         # Save file locally
         try:
-            file_content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(file_content)
-            
-            file_size = len(file_content)
-            logger.info(f"Successfully saved {file.filename} locally: {file_path}")
+            file_size = await save_upload_to_disk(file, file_path)
+            logger.info("Successfully saved %s locally: %s", file.filename, file_path)
         except Exception as e:
             logger.error(f"Failed to save file locally: {e}")
             raise HTTPException(status_code=500, detail="Failed to save file")
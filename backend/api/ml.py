@@ -2,9 +2,6 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
-import numpy as np
-from PIL import Image
-import io
 
 from db.database import get_db
 from db.models import MlPrediction
@@ -35,6 +32,10 @@ async def predict_brain_tumor(file: UploadFile = File(...)):
         "status": "processing"
     }
 
+# Clinical inputs the ML inference needs; the set gives a single C-level check
+REQUIRED_CLINICAL_FIELDS = ("age", "bmi", "glucose_level", "blood_pressure")
+REQUIRED_CLINICAL_FIELDS_SET = frozenset(REQUIRED_CLINICAL_FIELDS)
+
 @router.post("/trigger-prediction", status_code=202)
 async def trigger_ml_prediction(
     request: MlInferenceRequest,
@@ -46,10 +47,9 @@ async def trigger_ml_prediction(
     """
     try:
         # Validate clinical data
-        required_fields = ["age", "bmi", "glucose_level", "blood_pressure"]
-        missing_fields = [field for field in required_fields if field not in request.clinical_data]
-        
-        if missing_fields:
+        if not REQUIRED_CLINICAL_FIELDS_SET.issubset(request.clinical_data.keys()):
+            # Only build the ordered list for the error message
+            missing_fields = [field for field in REQUIRED_CLINICAL_FIELDS if field not in request.clinical_data]
             raise HTTPException(
                 status_code=400,
                 detail=f"Missing required clinical data fields: {', '.join(missing_fields)}"
@@ -80,7 +80,7 @@ async def trigger_ml_prediction(
         # Queue ML inference task
         run_ml_inference.delay(request.user_id, request.clinical_data)
         
-        logger.info(f"Queued ML inference for user: {request.user_id}")
+        logger.info("Queued ML inference for user: %s", request.user_id)
         
         return {
             "message": "ML prediction started",
@@ -111,11 +111,12 @@ def get_prediction(prediction_id: int, db: Session = Depends(get_db)):
 @router.delete("/predictions/{prediction_id}")
 def delete_prediction(prediction_id: int, db: Session = Depends(get_db)):
     """Delete a specific ML prediction"""
-    prediction = db.query(MlPrediction).filter(MlPrediction.id == prediction_id).first()
-    if not prediction:
+    deleted = db.query(MlPrediction).filter(
+        MlPrediction.id == prediction_id
+    ).delete(synchronize_session=False)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Prediction not found")
     
-    db.delete(prediction)
     db.commit()
     
     return {"message": "Prediction deleted successfully"}
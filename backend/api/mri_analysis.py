@@ -1,6 +1,7 @@
 import os
 import uuid
 import json
+import orjson
 import logging
 import time
 import numpy as np
@@ -23,6 +24,9 @@ from schemas.schemas import MRIAnalysisResponse, MRIUploadResponse
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/mri", tags=["mri-analysis"])
 
+# Accepted MRI image formats
+ALLOWED_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.tiff', '.tif', '.dcm', '.dicom')
+
 # Create MRI uploads directory if it doesn't exist
 MRI_UPLOAD_DIR = "uploads/mri"
 os.makedirs(MRI_UPLOAD_DIR, exist_ok=True)
@@ -237,7 +241,9 @@ def analyze_mri_image_real(image: Image.Image) -> dict:
                         }
                         
                         tumor_regions.append(tumor_region)
-                        logger.info(f"     - Real detection: {tumor_type} at ({cluster_x_min},{cluster_y_min}) area:{cluster_area}px confidence:{avg_confidence:.2f}")
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info("     - Real detection: %s at (%s,%s) area:%spx confidence:%.2f",
+                                        tumor_type, cluster_x_min, cluster_y_min, cluster_area, avg_confidence)
         
         # Calculate overall assessment
         if tumor_regions:
@@ -411,7 +417,8 @@ def create_annotated_image(original_image: Image.Image, detected_regions: List[D
                          center_x + marker_size, center_y + marker_size], 
                         fill=color, outline="white")
             
-            logger.info(f"     - Drew {tumor_type} at ({x},{y}) size {width}x{height}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("     - Drew %s at (%s,%s) size %sx%s", tumor_type, x, y, width, height)
         
         # Add legend in the corner
         legend_x = annotated_image.width - 120
@@ -644,7 +651,7 @@ def process_mri_analysis_background(analysis_id: int, file_path: str, file_conte
         
         analysis_record.status = "completed"
         analysis_record.analysis_completed_at = func.now()
-        analysis_record.results_json = json.dumps(analysis_results, indent=2)
+        analysis_record.results_json = orjson.dumps(analysis_results, option=orjson.OPT_SERIALIZE_NUMPY).decode()
         analysis_record.overall_risk_level = overall_risk
         analysis_record.confidence_score = confidence_avg
         
@@ -712,11 +719,10 @@ async def upload_mri_scan(
     """Upload MRI scan for analysis"""
     try:
         # Validate file type
-        allowed_extensions = ['.jpg', '.jpeg', '.png', '.tiff', '.tif', '.dcm', '.dicom']
-        if not any(file.filename.lower().endswith(ext) for ext in allowed_extensions):
+        if not file.filename.lower().endswith(ALLOWED_IMAGE_EXTENSIONS):
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+                detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_IMAGE_EXTENSIONS)}"
             )
         
         # Read file content
@@ -734,7 +740,7 @@ async def upload_mri_scan(
         filename = f"{file_uuid}_{file.filename}"
         file_path = os.path.join(MRI_UPLOAD_DIR, filename)
         
-        logger.info(f"Starting MRI upload for user {current_user.id}, file: {file.filename}")
+        logger.info("Starting MRI upload for user %s, file: %s", current_user.id, file.filename)
         
         # Save file locally
         with open(file_path, "wb") as f:
@@ -766,7 +772,7 @@ async def upload_mri_scan(
             file_content
         )
         
-        logger.info(f"MRI upload queued for processing: mri_analysis_id: {mri_analysis.id}")
+        logger.info("MRI upload queued for processing: mri_analysis_id: %s", mri_analysis.id)
         
         return MRIUploadResponse(
             id=mri_analysis.id,
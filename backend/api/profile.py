@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only, selectinload
 from typing import List
 import os
+import shutil
 import uuid
 
 from core.auth import get_current_user, get_current_active_patient
@@ -19,11 +20,14 @@ from schemas.auth_schemas import (
 
 router = APIRouter(prefix="/api/profile", tags=["patient-profile"])
 
+# Accepted avatar image types
+ALLOWED_AVATAR_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
 @router.get("/me", response_model=UserWithProfile)
-def get_my_profile(current_user: User = Depends(get_current_active_patient), db: Session = Depends(get_db)):
+def get_my_profile(current_user: User = Depends(get_current_active_patient)):
     """Get current user profile with patient details"""
-    user_with_profile = db.query(User).filter(User.id == current_user.id).first()
-    return user_with_profile
+    # The dependency already loaded this user in the request session
+    return current_user
 
 @router.put("/me", response_model=PatientProfileSchema)
 def update_my_profile(
@@ -63,11 +67,10 @@ def upload_avatar(
     """Upload user avatar image"""
     
     # Validate file type
-    allowed_extensions = ['.jpg', '.jpeg', '.png', '.gif']
-    if not any(file.filename.lower().endswith(ext) for ext in allowed_extensions):
+    if not file.filename.lower().endswith(ALLOWED_AVATAR_EXTENSIONS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_AVATAR_EXTENSIONS)}"
         )
     
     # Create avatars directory
@@ -83,8 +86,7 @@ def upload_avatar(
     # Save file
     try:
         with open(file_path, "wb") as f:
-            content = file.file.read()
-            f.write(content)
+            shutil.copyfileobj(file.file, f, 1 << 20)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -103,9 +105,6 @@ def upload_avatar(
 def get_dashboard(current_user: User = Depends(get_current_active_patient), db: Session = Depends(get_db)):
     """Get user dashboard with all relevant data"""
     
-    # Get user with profile
-    user_with_profile = db.query(User).filter(User.id == current_user.id).first()
-    
     # Get genomic data statistics
     genomic_data = db.query(GenomicData).filter(GenomicData.user_id == current_user.id).all()
     total_uploads = len(genomic_data)
@@ -138,7 +137,7 @@ def get_dashboard(current_user: User = Depends(get_current_active_patient), db:
     total_reports = 0
     
     return UserDashboard(
-        user=user_with_profile,
+        user=current_user,
         total_uploads=total_uploads,
         total_reports=total_reports,
         recent_uploads=recent_uploads,
@@ -150,12 +149,26 @@ def get_dashboard(current_user: User = Depends(get_current_active_patient), db:
 def get_my_uploads(current_user: User = Depends(get_current_active_patient), db: Session = Depends(get_db)):
     """Get all genomic uploads for current user"""
     
-    genomic_data = db.query(GenomicData).filter(GenomicData.user_id == current_user.id).all()
+    # One query for the uploads plus one batched IN query for all their scores,
+    # loading only the columns the listing returns
+    genomic_data = (
+        db.query(GenomicData)
+        .options(
+            load_only(
+                GenomicData.id, GenomicData.filename, GenomicData.status,
+                GenomicData.uploaded_at, GenomicData.metadata_json
+            ),
+            selectinload(GenomicData.prs_scores).load_only(
+                PrsScore.disease_type, PrsScore.score, PrsScore.calculated_at
+            ),
+        )
+        .filter(GenomicData.user_id == current_user.id)
+        .all()
+    )
     
     uploads = []
     for data in genomic_data:
-        # Get associated PRS scores
-        prs_scores = db.query(PrsScore).filter(PrsScore.genomic_data_id == data.id).all()
+        prs_scores = data.prs_scores
         
         uploads.append({
             "id": data.id,
@@ -54,7 +54,7 @@ async def trigger_prs_calculation(
         # Queue PRS calculation task
         calculate_prs_score.delay(request.genomic_data_id, request.disease_type)
         
-        logger.info(f"Queued PRS calculation for genomic_data_id: {request.genomic_data_id}, disease: {request.disease_type}")
+        logger.info("Queued PRS calculation for genomic_data_id: %s, disease: %s", request.genomic_data_id, request.disease_type)
         
         return {
             "message": "PRS calculation started",
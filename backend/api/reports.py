@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from typing import List
-import json
+import orjson
 
 from core.auth import get_current_active_patient
-from db.database import get_db
+from db.database import SessionLocal, get_db
 from db.auth_models import User, MedicalReport
 from db.models import GenomicData
 from services.report_generator import ReportGenerator
@@ -45,13 +45,16 @@ def generate_report(
             "status": existing_report.status
         }
     
-    # Generate report in background
+    # Generate report in background. The request's session is closed once the
+    # response is sent, so the task scopes its own session and returns it to the pool
+    user_id = current_user.id
+    
     def generate_report_task():
-        report_generator = ReportGenerator()
-        result = report_generator.generate_comprehensive_report(
-            current_user.id, genomic_data_id, db
-        )
-        return result
+        with SessionLocal() as task_db:
+            report_generator = ReportGenerator()
+            return report_generator.generate_comprehensive_report(
+                user_id, genomic_data_id, task_db
+            )
     
     background_tasks.add_task(generate_report_task)
     
@@ -121,7 +124,7 @@ def get_report(
     report_data = {}
     if report.report_data:
         try:
-            report_data = json.loads(report.report_data)
+            report_data = orjson.loads(report.report_data)
         except:
             report_data = {"error": "Could not parse report data"}
     
@@ -172,7 +175,7 @@ def download_report(
         report_data = {}
         if report.report_data:
             try:
-                report_data = json.loads(report.report_data)
+                report_data = orjson.loads(report.report_data)
             except:
                 report_data = {"error": "Could not parse report data"}
         
@@ -195,18 +198,18 @@ def delete_report(
 ):
     """Delete a report"""
     
-    report = db.query(MedicalReport).filter(
+    # Single DELETE ... WHERE id AND owner; rowcount tells us whether it existed
+    deleted = db.query(MedicalReport).filter(
         MedicalReport.id == report_id,
         MedicalReport.user_id == current_user.id
-    ).first()
+    ).delete(synchronize_session=False)
     
-    if not report:
+    if not deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Report not found"
         )
     
-    db.delete(report)
     db.commit()
     
     return {"message": "Report deleted successfully"}
@@ -13,23 +13,25 @@ class PresignResponse(BaseModel):
     token: str
 
 _def_client: Client | None = None
+_REQUIRED_SECRETS = ("SUPABASE_URL", "SUPABASE_SERVICE_ROLE_KEY")
+# The bucket never changes at runtime, so read it once instead of per presign
+SUPABASE_BUCKET = os.environ.get("SUPABASE_BUCKET", "uploads")
 
 def get_supabase() -> Client:
     global _def_client
     if _def_client is None:
-        url = os.environ.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-        if not url or not key:
-            raise RuntimeError("SUPABASE_URL or SUPABASE_SERVICE_ROLE_KEY not configured")
-        _def_client = create_client(url, key)
+        env = os.environ
+        missing = [name for name in _REQUIRED_SECRETS if not env.get(name)]
+        if missing:
+            raise RuntimeError(f"Supabase not configured, missing: {', '.join(missing)}")
+        _def_client = create_client(env["SUPABASE_URL"], env["SUPABASE_SERVICE_ROLE_KEY"])
     return _def_client
 
 @router.post("/presign", response_model=PresignResponse)
 def create_signed_upload_url(body: PresignRequest):
     try:
-        bucket = os.environ.get("SUPABASE_BUCKET", "uploads")
         client = get_supabase()
-        res = client.storage.from_(bucket).create_signed_upload_url(body.path)
+        res = client.storage.from_(SUPABASE_BUCKET).create_signed_upload_url(body.path)
         # res example: { 'signed_url': '...', 'token': '...' }
         token = res.get("token")
         if not token:
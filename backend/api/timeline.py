@@ -1,12 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from sqlalchemy import DateTime, Float, String, Text, cast, literal, null, select, union_all
 from datetime import datetime
 
 from db.database import get_db
 from db.models import GenomicData, PrsScore, MlPrediction
-from db.auth_models import User
 
 router = APIRouter(prefix="/api/timeline", tags=["timeline"])
 
@@ -14,72 +12,89 @@ router = APIRouter(prefix="/api/timeline", tags=["timeline"])
 def get_user_timeline(user_id: str, db: Session = Depends(get_db)):
     """Get timeline events for a specific user"""
     
-    timeline_events = []
+    # One UNION ALL round-trip for uploads, PRS scores and ML predictions,
+    # ordered newest first by the database. Rows without a timestamp are
+    # stamped "now" below, so they sort first.
+    uploads = select(
+        literal("upload").label("kind"),
+        GenomicData.id.label("id"),
+        GenomicData.uploaded_at.label("ts"),
+        GenomicData.filename.label("label"),
+        GenomicData.status.label("status"),
+        GenomicData.metadata_json.label("extra"),
+        cast(null(), Float).label("value")
+    ).where(GenomicData.user_id == user_id, GenomicData.uploaded_at.isnot(None))
+    
+    prs = select(
+        literal("prs"),
+        PrsScore.id,
+        PrsScore.calculated_at,
+        PrsScore.disease_type,
+        cast(null(), String),
+        cast(null(), Text),
+        PrsScore.score
+    ).join_from(PrsScore, GenomicData).where(GenomicData.user_id == user_id)
     
-    # Get genomic data uploads
-    genomic_uploads = db.query(GenomicData).filter(
-        GenomicData.user_id == user_id
-    ).order_by(desc(GenomicData.uploaded_at)).all()
+    ml = select(
+        literal("ml"),
+        MlPrediction.id,
+        cast(null(), DateTime(timezone=True)),  # ML predictions don't have timestamp yet
+        MlPrediction.prediction,
+        cast(null(), String),
+        cast(null(), Text),
+        MlPrediction.confidence
+    ).where(MlPrediction.user_id == user_id)
     
-    for upload in genomic_uploads:
-        if upload.uploaded_at:
+    events = union_all(uploads, prs, ml).subquery()
+    rows = db.execute(select(events).order_by(events.c.ts.desc().nulls_first())).all()
+    
+    now = datetime.now().isoformat()
+    timeline_events = []
+    for row in rows:
+        timestamp = row.ts.isoformat() if row.ts else now
+        if row.kind == "upload":
             timeline_events.append({
-                "id": f"upload_{upload.id}",
+                "id": f"upload_{row.id}",
                 "event_type": "upload",
                 "title": f"Genomic Data Upload",
-                "description": f"Uploaded {upload.filename}",
-                "timestamp": upload.uploaded_at.isoformat() if upload.uploaded_at else datetime.now().isoformat(),
-                "status": "completed" if upload.status == "completed" else "in-progress",
+                "description": f"Uploaded {row.label}",
+                "timestamp": timestamp,
+                "status": "completed" if row.status == "completed" else "in-progress",
                 "metadata": {
-                    "file_type": "VCF" if upload.filename.endswith('.vcf') else "FASTQ",
-                    "file_size": upload.metadata_json,
-                    "file_id": upload.id
+                    "file_type": "VCF" if row.label.endswith('.vcf') else "FASTQ",
+                    "file_size": row.extra,
+                    "file_id": row.id
+                }
+            })
+        elif row.kind == "prs":
+            timeline_events.append({
+                "id": f"prs_{row.id}",
+                "event_type": "analysis",
+                "title": f"PRS Analysis Complete",
+                "description": f"Polygenic Risk Score calculated for {row.label}",
+                "timestamp": timestamp,
+                "status": "completed",
+                "metadata": {
+                    "analysis_type": "PRS",
+                    "disease": row.label,
+                    "score": row.value,
+                    "severity": "high" if row.value > 0.7 else "medium" if row.value > 0.4 else "low"
+                }
+            })
+        else:
+            timeline_events.append({
+                "id": f"ml_{row.id}",
+                "event_type": "analysis", 
+                "title": "ML Prediction Analysis",
+                "description": f"Machine learning analysis: {row.label}",
+                "timestamp": timestamp,
+                "status": "completed",
+                "metadata": {
+                    "analysis_type": "ML",
+                    "prediction": row.label,
+                    "confidence": row.value
                 }
             })
-    
-    # Get PRS scores (analysis events)
-    prs_scores = db.query(PrsScore).join(GenomicData).filter(
-        GenomicData.user_id == user_id
-    ).order_by(desc(PrsScore.calculated_at)).all()
-    
-    for prs in prs_scores:
-        timeline_events.append({
-            "id": f"prs_{prs.id}",
-            "event_type": "analysis",
-            "title": f"PRS Analysis Complete",
-            "description": f"Polygenic Risk Score calculated for {prs.disease_type}",
-            "timestamp": prs.calculated_at.isoformat() if prs.calculated_at else datetime.now().isoformat(),
-            "status": "completed",
-            "metadata": {
-                "analysis_type": "PRS",
-                "disease": prs.disease_type,
-                "score": prs.score,
-                "severity": "high" if prs.score > 0.7 else "medium" if prs.score > 0.4 else "low"
-            }
-        })
-    
-    # Get ML predictions
-    ml_predictions = db.query(MlPrediction).filter(
-        MlPrediction.user_id == user_id
-    ).all()
-    
-    for ml in ml_predictions:
-        timeline_events.append({
-            "id": f"ml_{ml.id}",
-            "event_type": "analysis", 
-            "title": "ML Prediction Analysis",
-            "description": f"Machine learning analysis: {ml.prediction}",
-            "timestamp": datetime.now().isoformat(),  # ML predictions don't have timestamp yet
-            "status": "completed",
-            "metadata": {
-                "analysis_type": "ML",
-                "prediction": ml.prediction,
-                "confidence": ml.confidence
-            }
-        })
-    
-    # Sort events by timestamp (newest first)
-    timeline_events.sort(key=lambda x: x["timestamp"], reverse=True)
     
     # If no events found, add a welcome milestone
     if not timeline_events:
@@ -1,50 +1,48 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import importlib
 import logging
+import orjson
 
 from core.config import settings
 from db.database import create_tables
 
-# Import API routers
-from api.auth import router as auth_router
-from api.local_upload import router as local_upload_router
-from api.genomic_variants import router as genomic_variants_router
-from api.chatbot import router as chatbot_router
-from api.direct_prs import router as direct_prs_router
-from api.timeline import router as timeline_router
-from api.reports import router as reports_router
-from api.mri_analysis import router as mri_router
-from api.supabase_upload import router as supabase_upload_router
-# Optional routers that require heavy deps
-import os
-_ENHANCED_MRI_ENABLED = os.getenv("ENABLE_ENHANCED_MRI", "false").lower() in ("1", "true", "yes")
-if _ENHANCED_MRI_ENABLED:
-    try:
-        from api.enhanced_mri_analysis import router as enhanced_mri_router
-        _HAS_ENHANCED_MRI = True
-    except Exception as e:
-        enhanced_mri_router = None
-        _HAS_ENHANCED_MRI = False
-        logging.warning(f"Enhanced MRI router disabled: {e}")
-else:
-    enhanced_mri_router = None
-    _HAS_ENHANCED_MRI = False
-from api.profile import router as profile_router
-from api.feedback import router as feedback_router
+# API router modules, in registration order. Optional routers pull in heavy deps
+# (tensorflow, boto3) and are only imported when their settings flag is set.
+_ROUTERS = [
+    ("api.auth", True),
+    ("api.local_upload", True),
+    ("api.genomic_variants", True),
+    ("api.chatbot", True),
+    ("api.direct_prs", True),
+    ("api.timeline", True),
+    ("api.reports", True),
+    ("api.mri_analysis", True),
+    ("api.supabase_upload", True),
+    ("api.enhanced_mri_analysis", settings.enable_enhanced_mri),
+    ("api.profile", True),
+    ("api.feedback", True),
+    ("api.ml", settings.enable_ml),
+]
+_OPTIONAL_ROUTERS = {"api.enhanced_mri_analysis", "api.ml"}
 
-# Optional ML router (heavy deps like boto3/tensorflow)
-_ENABLE_ML = os.getenv("ENABLE_ML", "false").lower() in ("1", "true", "yes")
-if _ENABLE_ML:
-    try:
-        from api.ml import router as ml_router
-        _HAS_ML = True
-    except Exception as e:
-        ml_router = None
-        _HAS_ML = False
-        logging.warning(f"ML router disabled: {e}")
-else:
-    ml_router = None
-    _HAS_ML = False
+def register_router(app: FastAPI, module_name: str):
+    """Import an API module and mount its router"""
+    app.include_router(importlib.import_module(module_name).router)
+
+def register_routers(app: FastAPI):
+    """Mount every enabled API router; optional ones are skipped if their deps are missing"""
+    for module_name, enabled in _ROUTERS:
+        if not enabled:
+            continue
+        if module_name not in _OPTIONAL_ROUTERS:
+            register_router(app, module_name)
+            continue
+        try:
+            register_router(app, module_name)
+        except Exception as e:
+            logging.warning(f"{module_name} router disabled: {e}")
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +52,7 @@ app = FastAPI(
     version="2.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # orjson instead of stdlib json for every route
 )
 
 # CORS
@@ -63,24 +62,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Routers
-app.include_router(auth_router)
-app.include_router(local_upload_router)
-app.include_router(genomic_variants_router)
-app.include_router(chatbot_router)
-app.include_router(direct_prs_router)
-app.include_router(timeline_router)
-app.include_router(reports_router)
-app.include_router(mri_router)
-app.include_router(supabase_upload_router)
-if _HAS_ENHANCED_MRI and enhanced_mri_router is not None:
-    app.include_router(enhanced_mri_router)
-app.include_router(profile_router)
-app.include_router(feedback_router)
-if _HAS_ML and ml_router is not None:
-    app.include_router(ml_router)
+register_routers(app)
 
 @app.on_event("startup")
 def on_startup():
@@ -90,18 +76,28 @@ def on_startup():
     except Exception as e:
         logger.error(f"❌ Failed to create tables: {e}")
 
+@app.on_event("shutdown")
+def on_shutdown():
+    # Imported here: the pool module pulls in numpy/BioPython
+    from genomic_utils import shutdown_process_pool
+    shutdown_process_pool()
+
+# Static probe bodies are serialized once; liveness checks hit /health constantly
+HEALTH_RESPONSE = orjson.dumps({
+    "status": "healthy",
+    "service": "curagenie-api",
+    "version": "2.0.0",
+})
+ROOT_RESPONSE = orjson.dumps({
+    "message": "CuraGenie API",
+    "version": "2.0.0",
+    "docs": "/docs",
+})
+
 @app.get("/health")
 def health():
-    return {
-        "status": "healthy",
-        "service": "curagenie-api",
-        "version": "2.0.0",
-    }
+    return Response(content=HEALTH_RESPONSE, media_type="application/json")
 
 @app.get("/")
 def root():
-    return {
-        "message": "CuraGenie API",
-        "version": "2.0.0",
-        "docs": "/docs",
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
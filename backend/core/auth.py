@@ -1,18 +1,42 @@
 import jwt
-from datetime import datetime, timedelta
-from typing import Optional
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from core.config import settings
+from core.redis_client import get_redis, mark_redis_unavailable, redis
 from db.database import get_db
-from db.auth_models import User
+from db.auth_models import User, UserRole
 from schemas.auth_schemas import TokenData
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Password hashing: Argon2id (OWASP baseline: 19 MiB, t=2, p=1) for new hashes;
+# bcrypt and older Argon2 hashes still verify and are upgraded on next login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
+
+# Load the argon2/bcrypt backends now rather than on the first login of each worker
+try:
+    for _scheme in pwd_context.schemes():
+        pwd_context.handler(_scheme).get_backend()
+except Exception as e:
+    logger.warning(f"⚠️ Password hash backend preload failed: {e}")
 
 # JWT Security
 security = HTTPBearer()
@@ -20,7 +44,22 @@ security = HTTPBearer()
 # JWT Configuration
 SECRET_KEY = settings.secret_key
 ALGORITHM = "HS256"
+# HMAC key as bytes once, instead of re-encoding the secret on every sign/verify
+_SIGNING_KEY = SECRET_KEY.encode()
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+_JWT_ALGORITHMS = [ALGORITHM]
+_JWT_DECODE_OPTIONS = {"require": ["exp"], "verify_exp": True}
+
+# Verified-token LRU cache: blake2b-128(token) -> (cache_expiry, TokenData).
+# Entries live at most TOKEN_CACHE_TTL_SECONDS and never past the token's exp;
+# failed verifications are never cached and raw tokens are never stored.
+TOKEN_CACHE_TTL_SECONDS = 5
+TOKEN_CACHE_MAXSIZE = 10000
+_token_cache: "OrderedDict[bytes, Tuple[float, TokenData]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+# Revoked token ids (jti) live in Redis until the token would have expired
+TOKEN_BLACKLIST_PREFIX = "bl:"
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -33,18 +72,66 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
+    now = int(time.time())
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # Integer epoch claims skip PyJWT's per-datetime timegm conversion
+    to_encode.update({"iat": now, "exp": expire, "jti": uuid.uuid4().hex})
+    encoded_jwt = jwt.encode(to_encode, _SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _token_cache_key(token: str) -> bytes:
+    """Cache key for a raw token (the token itself is never stored)"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _is_token_revoked(jti: Optional[str]) -> bool:
+    """Check the Redis blacklist; reads fail open, logout fails closed (see revoke_token)"""
+    client = get_redis()
+    if jti is None or client is None:
+        return False
+    try:
+        return bool(client.exists(f"{TOKEN_BLACKLIST_PREFIX}{jti}"))
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        return False
+
+def revoke_token(token: str, token_data: TokenData):
+    """Blacklist a token for its remaining lifetime and drop it from the cache"""
+    with _token_cache_lock:
+        _token_cache.pop(_token_cache_key(token), None)
+    
+    ttl = int(token_data.exp - time.time()) if token_data.exp else 0
+    if ttl <= 0:
+        return  # Already expired (decode requires exp), nothing left to revoke
+    
+    # Logout must not report success while the token still works elsewhere
+    revocation_failed = HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Logout is temporarily unavailable; the token could not be revoked",
+    )
+    client = get_redis()
+    if token_data.jti is None or client is None:
+        raise revocation_failed
+    try:
+        client.setex(f"{TOKEN_BLACKLIST_PREFIX}{token_data.jti}", ttl, b"1")
+    except redis.RedisError as e:
+        mark_redis_unavailable(e)
+        raise revocation_failed
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify JWT token"""
     token = credentials.credentials
+    cache_key = _token_cache_key(token)
+    now = time.time()
+    
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            _token_cache.move_to_end(cache_key)
+            return cached[1]
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,14 +140,27 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     )
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, _SIGNING_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = TokenData(
+            email=email, role=payload.get("role"), jti=payload.get("jti"), exp=payload["exp"]
+        )
     except jwt.PyJWTError:
         raise credentials_exception
     
+    # Only checked on a cache miss; logout also evicts the local cache entry
+    if _is_token_revoked(token_data.jti):
+        raise credentials_exception
+    
+    cache_expiry = min(payload["exp"], now + TOKEN_CACHE_TTL_SECONDS)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (cache_expiry, token_data)
+        _token_cache.move_to_end(cache_key)
+        if len(_token_cache) > TOKEN_CACHE_MAXSIZE:
+            _token_cache.popitem(last=False)
+    
     return token_data
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -76,8 +176,13 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        # Hash was made with a deprecated scheme or old parameters
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 def get_current_user(
@@ -98,11 +203,33 @@ def get_current_user(
         )
     return user
 
-def get_current_active_patient(current_user: User = Depends(get_current_user)) -> User:
-    """Get current active patient user"""
-    if current_user.role.value != "patient":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    return current_user
+def require_role(*roles: UserRole):
+    """Build a dependency that only admits active users with one of the given roles"""
+    allowed_roles = frozenset(roles)
+    allowed_claims = frozenset(role.value for role in roles)
+    
+    def check_token_role(token_data: TokenData = Depends(verify_token)) -> TokenData:
+        """Reject tokens whose role claim is not allowed before any DB lookup"""
+        # Tokens issued before the role claim existed fall through to the DB check
+        if token_data.role is not None and token_data.role not in allowed_claims:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        return token_data
+    
+    def check_user_role(
+        token_data: TokenData = Depends(check_token_role),
+        current_user: User = Depends(get_current_user)
+    ) -> User:
+        if current_user.role not in allowed_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        return current_user
+    
+    return check_user_role
+
+# Built once at import; routes share the same dependency callables
+get_current_active_patient = require_role(UserRole.PATIENT)
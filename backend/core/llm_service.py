@@ -11,14 +11,29 @@ Provides genomics-specialized prompting and context management.
 
 import logging
 import json
+import threading
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 import openai
 import requests
+from fastapi.concurrency import run_in_threadpool
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared keep-alive session for the HTTP-based providers, so each chat turn
+# reuses a pooled connection instead of a fresh TCP/TLS handshake
+LLM_HTTP_TIMEOUT = (5, 60)  # (connect, read) seconds
+_http = requests.Session()
+_http_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=Retry(total=2, backoff_factor=0.1))
+_http.mount("http://", _http_adapter)
+_http.mount("https://", _http_adapter)
+
+# PRS scores above this are listed as high-risk conditions in the chat context
+HIGH_RISK_PRS_THRESHOLD = 0.6
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers"""
     
@@ -48,8 +63,9 @@ class OpenAIProvider(LLMProvider):
                 {"role": "user", "content": user_message}
             ]
             
-            # Generate response
-            response = self.client.chat.completions.create(
+            # Generate response (the SDK call blocks, so run it off the event loop)
+            response = await run_in_threadpool(
+                self.client.chat.completions.create,
                 model=settings.llm_model,
                 messages=messages,
                 max_tokens=500,
@@ -132,7 +148,9 @@ class AnthropicProvider(LLMProvider):
                 "messages": [{"role": "user", "content": user_message}]
             }
             
-            response = requests.post(self.base_url, headers=headers, json=data)
+            response = await run_in_threadpool(
+                _http.post, self.base_url, headers=headers, json=data, timeout=LLM_HTTP_TIMEOUT
+            )
             response.raise_for_status()
             
             result = response.json()
@@ -172,7 +190,9 @@ class OllamaProvider(LLMProvider):
                 }
             }
             
-            response = requests.post(f"{self.base_url}/api/generate", json=data)
+            response = await run_in_threadpool(
+                _http.post, f"{self.base_url}/api/generate", json=data, timeout=LLM_HTTP_TIMEOUT
+            )
             response.raise_for_status()
             
             result = response.json()
@@ -190,7 +210,19 @@ class GenomicLLMService:
     """Main service for genomic LLM interactions"""
     
     def __init__(self):
-        self.provider = self._initialize_provider()
+        # Built on first use, so importing the chatbot router doesn't construct
+        # an SDK client or probe provider config
+        self._provider: Optional[LLMProvider] = None
+        self._provider_lock = threading.Lock()
+    
+    @property
+    def provider(self) -> LLMProvider:
+        """The configured provider, initialized once on first access"""
+        if self._provider is None:
+            with self._provider_lock:
+                if self._provider is None:
+                    self._provider = self._initialize_provider()
+        return self._provider
     
     def _initialize_provider(self) -> LLMProvider:
         """Initialize the configured LLM provider"""
@@ -214,6 +246,11 @@ class GenomicLLMService:
     
     async def get_user_context(self, user_id: str) -> Dict[str, Any]:
         """Fetch user's genomic context from database"""
+        # Sync SQLAlchemy session; keep its queries off the event loop
+        return await run_in_threadpool(self._load_user_context, user_id)
+    
+    def _load_user_context(self, user_id: str) -> Dict[str, Any]:
+        """Load the user's PRS scores and key variants (blocking)"""
         # This would integrate with your existing database models
         # For now, return mock context - you'll need to implement the real database queries
         
@@ -221,53 +258,55 @@ class GenomicLLMService:
             from db.database import SessionLocal
             from db.models import GenomicData, PrsScore
             
-            db = SessionLocal()
-            
-            # Get user's genomic data
-            genomic_data = db.query(GenomicData).filter(GenomicData.user_id == user_id).all()
-            prs_scores = db.query(PrsScore).join(GenomicData).filter(GenomicData.user_id == user_id).all()
+            # The context manager returns the connection to the pool even if a query fails
+            with SessionLocal() as db:
+                # Get user's genomic data; only the columns used below
+                genomic_data = db.query(GenomicData.metadata_json).filter(GenomicData.user_id == user_id).all()
+                prs_scores = db.query(
+                    PrsScore.disease_type,
+                    PrsScore.score
+                ).join(GenomicData).filter(GenomicData.user_id == user_id).all()
             
-            context = {
-                "user_id": user_id,
-                "prs_scores": {},
-                "genomic_variants": [],
-                "risk_conditions": [],
-                "recommendations": []
-            }
-            
-            # Process PRS scores
-            for prs in prs_scores:
-                context["prs_scores"][prs.disease_type] = {
-                    "score": prs.score,
-                    "interpretation": self._interpret_prs_score(prs.score),
-                    "percentile": self._score_to_percentile(prs.score)
+                context = {
+                    "user_id": user_id,
+                    "prs_scores": {},
+                    "genomic_variants": [],
+                    "risk_conditions": [],
+                    "recommendations": []
                 }
+            
+                # Process PRS scores
+                for prs in prs_scores:
+                    context["prs_scores"][prs.disease_type] = {
+                        "score": prs.score,
+                        "interpretation": self._interpret_prs_score(prs.score),
+                        "percentile": self._score_to_percentile(prs.score)
+                    }
                 
-                if prs.score > 0.6:  # High risk threshold
-                    context["risk_conditions"].append(prs.disease_type)
+                    if prs.score > HIGH_RISK_PRS_THRESHOLD:
+                        context["risk_conditions"].append(prs.disease_type)
             
-            # Process genomic variants (from metadata)
-            for gdata in genomic_data:
-                if gdata.metadata_json and gdata.metadata_json.get("sample_variants"):
-                    variants = gdata.metadata_json["sample_variants"]
-                    for variant in variants[:5]:  # Top 5 variants
-                        if variant.get("id"):
-                            context["genomic_variants"].append({
-                                "id": variant["id"],
-                                "chromosome": variant.get("chromosome"),
-                                "type": variant.get("variant_type"),
-                                "quality": variant.get("quality")
-                            })
+                # Process genomic variants (from metadata)
+                for gdata in genomic_data:
+                    if gdata.metadata_json and gdata.metadata_json.get("sample_variants"):
+                        variants = gdata.metadata_json["sample_variants"]
+                        for variant in variants[:5]:  # Top 5 variants
+                            if variant.get("id"):
+                                context["genomic_variants"].append({
+                                    "id": variant["id"],
+                                    "chromosome": variant.get("chromosome"),
+                                    "type": variant.get("variant_type"),
+                                    "quality": variant.get("quality")
+                                })
             
-            # Generate recommendations based on risk
-            if "diabetes" in context["risk_conditions"]:
-                context["recommendations"].extend([
-                    "Regular HbA1c monitoring",
-                    "Mediterranean diet pattern", 
-                    "Regular exercise routine"
-                ])
+                # Generate recommendations based on risk
+                if "diabetes" in context["risk_conditions"]:
+                    context["recommendations"].extend([
+                        "Regular HbA1c monitoring",
+                        "Mediterranean diet pattern", 
+                        "Regular exercise routine"
+                    ])
             
-            db.close()
             return context
             
         except Exception as e:
@@ -291,11 +330,12 @@ class GenomicLLMService:
         """Convert PRS score to population percentile (simplified)"""
         return min(99, int(score * 100))
     
-    async def generate_response(self, user_id: str, message: str) -> str:
+    async def generate_response(self, user_id: str, message: str, user_context: Optional[Dict[str, Any]] = None) -> str:
         """Generate contextualized response for user"""
         try:
-            # Get user context
-            user_context = await self.get_user_context(user_id)
+            # Callers that already loaded the context pass it in
+            if user_context is None:
+                user_context = await self.get_user_context(user_id)
             
             # Generate response using configured provider
             response = await self.provider.generate_response(message, user_context)
@@ -316,7 +356,7 @@ class MockProvider(LLMProvider):
         if any(word in message_lower for word in ['prs', 'risk', 'score']):
             if user_context.get("prs_scores"):
                 high_risk = [disease for disease, data in user_context["prs_scores"].items() 
-                           if data.get("score", 0) > 0.6]
+                           if data.get("score", 0) > HIGH_RISK_PRS_THRESHOLD]
                 if high_risk:
                     return f"Based on your genomic analysis, you have elevated polygenic risk scores for {', '.join(high_risk)}. This indicates increased susceptibility, but remember that genetics is just one factor. I'd recommend discussing prevention strategies with your healthcare provider."
             
@@ -0,0 +1,87 @@
+import logging
+import threading
+import time
+
+from fastapi import HTTPException, Request, status
+
+from core.redis_client import get_redis, mark_redis_unavailable, redis
+
+logger = logging.getLogger(__name__)
+
+# Atomic token bucket: refill by elapsed time, take one token if available.
+# KEYS[1] = bucket key; ARGV = capacity, refill rate (tokens/ms), now (ms), cost
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return allowed
+"""
+
+_token_bucket_script = None
+_token_bucket_script_lock = threading.Lock()
+
+
+def _get_token_bucket_script(client):
+    """Register the Lua script once per process, even under concurrent first requests"""
+    global _token_bucket_script
+    if _token_bucket_script is None:
+        with _token_bucket_script_lock:
+            if _token_bucket_script is None:
+                # register_script() uses EVALSHA and reloads on NOSCRIPT
+                _token_bucket_script = client.register_script(TOKEN_BUCKET_LUA)
+    return _token_bucket_script
+
+
+class TokenBucket:
+    """Per-client, per-route token bucket enforced with one EVALSHA in Redis"""
+
+    def __init__(self, capacity: int, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_ms = refill_per_second / 1000.0
+
+    def __call__(self, request: Request):
+        client = get_redis()
+        if client is None:
+            return  # Fail open: rate limiting must never take auth down
+
+        host = request.client.host if request.client else "unknown"
+        key = f"tb:{host}:{request.url.path}"
+        try:
+            allowed = _get_token_bucket_script(client)(
+                keys=[key],
+                args=[self.capacity, self.refill_per_ms, int(time.time() * 1000), 1],
+            )
+        except redis.RedisError as e:
+            mark_redis_unavailable(e)
+            return
+
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+            )
+
+
+# Shared limits for credential endpoints
+login_rate_limit = TokenBucket(capacity=5, refill_per_second=5 / 60)
+register_rate_limit = TokenBucket(capacity=5, refill_per_second=5 / 60)
+password_reset_rate_limit = TokenBucket(capacity=3, refill_per_second=3 / 300)
@@ -0,0 +1,43 @@
+import logging
+import time
+
+from core.config import settings
+
+try:
+    import redis
+except ImportError:  # Deployed requirements include redis; bare dev installs may not
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Seconds to skip Redis after a connection failure instead of retrying per request
+REDIS_RETRY_SECONDS = 30
+
+_redis_client = None
+_redis_retry_at = 0.0
+
+
+def get_redis():
+    """Get the shared Redis client, or None if Redis is unavailable"""
+    global _redis_client
+    if redis is None or time.monotonic() < _redis_retry_at:
+        return None
+    if _redis_client is None:
+        # Bounded pool: threadpool handlers wait briefly for a free connection
+        # instead of opening an unbounded number of sockets per worker
+        pool = redis.BlockingConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            timeout=0.5,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        _redis_client = redis.Redis(connection_pool=pool)
+    return _redis_client
+
+
+def mark_redis_unavailable(error: Exception):
+    """Back off from Redis for a while after a failure"""
+    global _redis_retry_at
+    _redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+    logger.warning(f"⚠️ Redis unavailable, skipping for {REDIS_RETRY_SECONDS}s: {error}")
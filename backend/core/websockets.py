@@ -16,7 +16,7 @@ class ConnectionManager:
         """Accept and store a WebSocket connection for a user"""
         await websocket.accept()
         self.active_connections[user_id] = websocket
-        logger.info(f"User {user_id} connected via WebSocket")
+        logger.info("User %s connected via WebSocket", user_id)
         
         # Send welcome message
         await self.send_personal_message(
@@ -32,7 +32,7 @@ class ConnectionManager:
         """Remove a user's WebSocket connection"""
         if user_id in self.active_connections:
             del self.active_connections[user_id]
-            logger.info(f"User {user_id} disconnected from WebSocket")
+            logger.info("User %s disconnected from WebSocket", user_id)
     
     async def send_personal_message(self, user_id: str, message: dict):
         """Send a JSON message to a specific user"""
@@ -40,7 +40,7 @@ class ConnectionManager:
             try:
                 websocket = self.active_connections[user_id]
                 await websocket.send_json(message)
-                logger.info(f"Sent message to user {user_id}: {message.get('event', 'unknown')}")
+                logger.info("Sent message to user %s: %s", user_id, message.get('event', 'unknown'))
             except Exception as e:
                 logger.error(f"Failed to send message to user {user_id}: {e}")
                 # Remove the connection if it's broken
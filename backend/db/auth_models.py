@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, DateTime, Enum
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Text, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from db.database import Base
+from db.database import Base, BigIntegerId
 import enum
 from datetime import datetime
 
@@ -12,12 +12,19 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = 'users'
+    # Fetch server defaults (created_at) with the INSERT via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerId, primary_key=True)
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    role = Column(Enum(UserRole), default=UserRole.PATIENT)
+    # VARCHAR + CHECK instead of a native ENUM type: adding a role later is a
+    # constraint swap rather than ALTER TYPE on PostgreSQL
+    role = Column(
+        Enum(UserRole, native_enum=False, create_constraint=True, length=16, name="user_role"),
+        default=UserRole.PATIENT,
+    )
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -31,8 +38,8 @@ class User(Base):
 class PatientProfile(Base):
     __tablename__ = 'patient_profiles'
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id'), unique=True)
+    id = Column(BigIntegerId, primary_key=True)
+    user_id = Column(BigIntegerId, ForeignKey('users.id'), unique=True)
     
     # Personal Information
     first_name = Column(String, nullable=False)
@@ -59,10 +66,15 @@ class PatientProfile(Base):
 
 class MedicalReport(Base):
     __tablename__ = 'medical_reports'
+    __table_args__ = (
+        # Append-only timestamp: BRIN stays tiny on PostgreSQL, skipped elsewhere
+        Index('idx_medical_reports_generated_brin', 'generated_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}).ddl_if(dialect='postgresql'),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.id'))
-    genomic_data_id = Column(Integer, ForeignKey('genomic_data.id'), nullable=True)
+    id = Column(BigIntegerId, primary_key=True)
+    user_id = Column(BigIntegerId, ForeignKey('users.id'))
+    genomic_data_id = Column(BigIntegerId, ForeignKey('genomic_data.id'), nullable=True)
     
     # Report Details
     report_title = Column(String, nullable=False)
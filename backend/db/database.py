@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, BigInteger, Integer
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from core.config import settings
@@ -6,31 +7,48 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_is_sqlite = make_url(settings.database_url).get_backend_name() == "sqlite"
+
+# Pool sizing only applies to server databases; SQLite keeps its dialect
+# default pool (SingletonThreadPool for :memory: rejects these arguments)
+if _is_sqlite:
+    _engine_options = {"connect_args": {"check_same_thread": False}}
+else:
+    _engine_options = {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_use_lifo": True,  # Reuse the most recently returned (warm) connection
+    }
+
 # Create SQLAlchemy engine
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
     pool_recycle=300,
-    echo=settings.debug  # Log SQL queries in debug mode
+    echo=settings.debug,  # Log SQL queries in debug mode
+    **_engine_options
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class; instances stay loaded after commit, so handlers
+# can return what they just wrote without a refresh SELECT
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create Base class for models
 Base = declarative_base()
 
+# 64-bit ids on server databases; SQLite only autoincrements INTEGER PRIMARY KEY
+BigIntegerId = BigInteger().with_variant(Integer, "sqlite")
+
 def get_db() -> Session:
     """Dependency to get database session"""
-    db = SessionLocal()
-    try:
-        yield db
-    except Exception as e:
-        logger.error(f"Database session error: {e}")
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    # Closing the session returns its connection to the engine's pool
+    with SessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database session error: {e}")
+            db.rollback()
+            raise
 
 def create_tables():
     """Create all database tables"""
@@ -1,19 +1,29 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, Text, DateTime
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from db.database import Base
+from db.database import Base, BigIntegerId
 import json
+from datetime import datetime, timezone
+
+def _utcnow() -> datetime:
+    """Client-side timestamp; tables created before the server default still get one"""
+    return datetime.now(timezone.utc)
 
 class GenomicData(Base):
     __tablename__ = 'genomic_data'
+    __table_args__ = (
+        # Append-only timestamp: BRIN stays tiny on PostgreSQL, skipped elsewhere
+        Index('idx_genomic_data_uploaded_brin', 'uploaded_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}).ddl_if(dialect='postgresql'),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerId, primary_key=True)
     user_id = Column(String, index=True)
-    filename = Column(String, index=True)
-    file_url = Column(String, index=True)
+    filename = Column(String)
+    file_url = Column(String)  # Long storage URLs; never filtered on, so left unindexed
     status = Column(String, default='processing')
     metadata_json = Column(Text, default='{}')
-    uploaded_at = Column(DateTime, default=None)
+    uploaded_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     
     # Relationships
     prs_scores = relationship("PrsScore", back_populates="genomic_data")
@@ -21,10 +31,16 @@ class GenomicData(Base):
 
 class PrsScore(Base):
     __tablename__ = 'prs_scores'
+    __table_args__ = (
+        # Covers lookups/joins by genomic_data_id and per-disease filters
+        Index('idx_prs_scores_data_disease', 'genomic_data_id', 'disease_type'),
+        Index('idx_prs_scores_calculated_brin', 'calculated_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}).ddl_if(dialect='postgresql'),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    genomic_data_id = Column(Integer, ForeignKey('genomic_data.id'))
-    disease_type = Column(String, index=True)
+    id = Column(BigIntegerId, primary_key=True)
+    genomic_data_id = Column(BigIntegerId, ForeignKey('genomic_data.id'))
+    disease_type = Column(String)
     score = Column(Float)
     calculated_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -34,15 +50,19 @@ class PrsScore(Base):
 class MlPrediction(Base):
     __tablename__ = 'ml_predictions'
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerId, primary_key=True)
     user_id = Column(String, index=True)
     prediction = Column(String)
     confidence = Column(Float)
 
 class MRIAnalysis(Base):
     __tablename__ = 'mri_analyses'
+    __table_args__ = (
+        Index('idx_mri_analyses_uploaded_brin', 'uploaded_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}).ddl_if(dialect='postgresql'),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(BigIntegerId, primary_key=True)
     user_id = Column(String, index=True)
     filename = Column(String)
     file_path = Column(String)
@@ -52,6 +72,6 @@ class MRIAnalysis(Base):
     overall_risk_level = Column(String)  # low, moderate, high
     confidence_score = Column(Float)
     error_message = Column(Text)
-    uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
+    uploaded_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
     analysis_started_at = Column(DateTime(timezone=True), default=None)
     analysis_completed_at = Column(DateTime(timezone=True), default=None)
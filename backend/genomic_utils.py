@@ -10,15 +10,24 @@ This module provides comprehensive parsing and analysis of genomic files includi
 
 import gzip
 import logging
+import os
 import statistics
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any
-from io import BytesIO, StringIO
+from io import BytesIO, TextIOWrapper
+from itertools import islice
 import re
 from collections import defaultdict, Counter
 import numpy as np
 from Bio import SeqIO
 from Bio.Seq import Seq
 
+try:
+    import cyvcf2  # htslib-backed VCF reader; optional, text parser is the fallback
+except ImportError:
+    cyvcf2 = None
+
 # Try different GC import locations
 try:
     from Bio.SeqUtils import gc_fraction as GC
@@ -35,6 +44,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Records parsed in full per file; the remainder is only counted
+VCF_SAMPLE_SIZE = 50000
+FASTQ_SAMPLE_SIZE = 10000
+
+# A VCF data line, as the sampling loop sees it: not a # line and not blank
+VCF_DATA_LINE = re.compile(rb'^(?!#)[ \t\r\f\v]*\S', re.MULTILINE)
+
 class FastqAnalyzer:
     """Advanced FASTQ file analysis with comprehensive quality metrics"""
     
@@ -53,23 +69,25 @@ class FastqAnalyzer:
             if filename.lower().endswith('.gz'):
                 file_content = gzip.decompress(file_content)
             
-            # Parse sequences using BioPython
-            # Convert bytes to string for BioPython parsing
-            file_text = file_content.decode('utf-8')
-            sequences = list(SeqIO.parse(StringIO(file_text), "fastq"))
-            total_sequences = len(sequences)
+            # Parse only the sampled reads with BioPython, streaming from the
+            # raw bytes instead of decoding the file and building every record
+            records = SeqIO.parse(TextIOWrapper(BytesIO(file_content), encoding='utf-8'), "fastq")
+            sample_sequences = list(islice(records, FASTQ_SAMPLE_SIZE))
+            sample_size = len(sample_sequences)
             
-            if total_sequences == 0:
+            if sample_size == 0:
                 return {
                     "status": "error",
                     "message": "No valid sequences found in FASTQ file"
                 }
             
-            logger.info(f"Parsing {total_sequences} sequences from FASTQ file")
+            # Small files are fully parsed; otherwise count reads from line breaks
+            if sample_size < FASTQ_SAMPLE_SIZE:
+                total_sequences = sample_size
+            else:
+                total_sequences = self._count_records(file_content)
             
-            # Extract metrics for analysis (use subset for large files)
-            sample_size = min(total_sequences, 10000)  # Analyze up to 10k reads
-            sample_sequences = sequences[:sample_size]
+            logger.info(f"Parsing {total_sequences} sequences from FASTQ file")
             
             # Calculate comprehensive metrics
             read_lengths = [len(seq.seq) for seq in sample_sequences]
@@ -123,7 +141,7 @@ class FastqAnalyzer:
                         "length": len(seq.seq),
                         "gc_content": round(GC(seq.seq), 2)
                     }
-                    for seq in sequences[:3]
+                    for seq in sample_sequences[:3]
                 ]
             }
             
@@ -140,44 +158,49 @@ class FastqAnalyzer:
                 "message": f"FASTQ parsing failed: {str(e)}"
             }
     
+    @staticmethod
+    def _count_records(file_content: bytes) -> int:
+        """Count FASTQ reads as lines // 4 using bytes.count (no per-line Python work)"""
+        end = len(file_content)
+        while end > 0 and file_content[end - 1] in b' \t\r\n':
+            end -= 1
+        if end == 0:
+            return 0
+        return (file_content.count(b'\n', 0, end) + 1) // 4
+    
     def _analyze_quality_scores(self, sequences: List) -> Dict[str, Any]:
         """Analyze quality scores across all reads"""
-        all_quality_scores = []
-        per_base_quality = defaultdict(list)
-        
-        for seq in sequences:
-            if hasattr(seq, 'letter_annotations') and 'phred_quality' in seq.letter_annotations:
-                quality_scores = seq.letter_annotations['phred_quality']
-                all_quality_scores.extend(quality_scores)
-                
-                # Per-base quality (for position-specific analysis)
-                for pos, qual in enumerate(quality_scores[:100]):  # First 100 positions
-                    per_base_quality[pos].append(qual)
+        read_qualities = [
+            np.asarray(seq.letter_annotations['phred_quality'], dtype=np.uint8)
+            for seq in sequences
+            if hasattr(seq, 'letter_annotations') and 'phred_quality' in seq.letter_annotations
+        ]
+        read_qualities = [q for q in read_qualities if q.size]
         
-        if not all_quality_scores:
+        if not read_qualities:
             return {"status": "no_quality_data"}
         
-        # Calculate quality metrics
-        mean_quality = statistics.mean(all_quality_scores)
-        median_quality = statistics.median(all_quality_scores)
+        # One contiguous array for all bases instead of a list of Python ints
+        all_quality_scores = np.concatenate(read_qualities)
+        total_bases = all_quality_scores.size
         
         # Quality distribution
-        high_quality_bases = sum(1 for q in all_quality_scores if q >= 30)
-        medium_quality_bases = sum(1 for q in all_quality_scores if 20 <= q < 30)
-        low_quality_bases = sum(1 for q in all_quality_scores if q < 20)
-        total_bases = len(all_quality_scores)
-        
-        # Per-position quality (first 50 positions)
-        per_position_quality = {}
-        if per_base_quality:  # Only process if we have quality data
-            max_pos = max(per_base_quality.keys()) if per_base_quality else 0
-            for pos in range(min(50, max_pos + 1)):
-                if pos in per_base_quality:
-                    per_position_quality[pos] = statistics.mean(per_base_quality[pos])
+        high_quality_bases = int(np.count_nonzero(all_quality_scores >= 30))
+        low_quality_bases = int(np.count_nonzero(all_quality_scores < 20))
+        medium_quality_bases = total_bases - high_quality_bases - low_quality_bases
+        
+        # Per-position quality (first 50 positions), NaN-padded for short reads
+        width = min(50, max(q.size for q in read_qualities))
+        per_position = np.full((len(read_qualities), width), np.nan, dtype=np.float32)
+        for row, q in enumerate(read_qualities):
+            n = min(width, q.size)
+            per_position[row, :n] = q[:n]
+        position_means = np.nanmean(per_position, axis=0, dtype=np.float64)
+        per_position_quality = {pos: float(mean) for pos, mean in enumerate(position_means)}
         
         return {
-            "mean_quality": round(mean_quality, 2),
-            "median_quality": round(median_quality, 2),
+            "mean_quality": round(float(all_quality_scores.mean(dtype=np.float64)), 2),
+            "median_quality": round(float(np.median(all_quality_scores)), 2),
             "quality_distribution": {
                 "high_quality_percent": round(100 * high_quality_bases / total_bases, 2),
                 "medium_quality_percent": round(100 * medium_quality_bases / total_bases, 2),
@@ -254,71 +277,40 @@ class VcfAnalyzer:
             if filename.lower().endswith('.gz'):
                 file_content = gzip.decompress(file_content)
             
-            # Decode content
-            vcf_content = file_content.decode('utf-8')
-            lines = vcf_content.split('\n')
+            # Decode only the header and the sampled records; the rest of the
+            # file is counted in place rather than decoded and split into a list
+            header_lines = []
+            sample_variants = []
+            pos, end = 0, len(file_content)
+            while pos < end and len(sample_variants) < VCF_SAMPLE_SIZE:
+                newline = file_content.find(b'\n', pos)
+                if newline == -1:
+                    newline = end
+                line = file_content[pos:newline].decode('utf-8').rstrip('\r')
+                pos = newline + 1
+                if line.startswith('#'):
+                    header_lines.append(line)
+                elif line.strip():
+                    sample_variants.append(line)
             
-            # Parse header and metadata
-            header_info = self._parse_vcf_header(lines)
+            total_variants = len(sample_variants) + self._count_records(file_content, pos)
             
-            # Parse variants
-            variant_lines = [line for line in lines 
-                           if not line.startswith('#') and line.strip()]
+            # Parse header and metadata
+            header_info = self._parse_vcf_header(header_lines)
             
-            if not variant_lines:
+            if not total_variants:
                 return {
                     "status": "error",
                     "message": "No variants found in VCF file"
                 }
             
-            logger.info(f"Parsing {len(variant_lines)} variants from VCF file")
+            logger.info(f"Parsing {total_variants} variants from VCF file")
             
-            # Analyze variants (use subset for large files)
-            sample_size = min(len(variant_lines), 50000)  # Analyze up to 50k variants
-            sample_variants = variant_lines[:sample_size]
-            
-            # Parse and analyze variants
-            parsed_variants = []
-            chromosome_stats = defaultdict(int)
-            variant_type_stats = defaultdict(int)
-            quality_scores = []
-            
-            for line in sample_variants:
-                variant_info = self._parse_variant_line(line)
-                if variant_info:
-                    parsed_variants.append(variant_info)
-                    chromosome_stats[variant_info['chromosome']] += 1
-                    variant_type_stats[variant_info['variant_type']] += 1
-                    if variant_info['quality'] is not None:
-                        quality_scores.append(variant_info['quality'])
-            
-            # Calculate comprehensive statistics
-            metadata = {
-                "file_type": "VCF",
-                "total_variants": len(variant_lines),
-                "sample_analyzed": len(parsed_variants),
-                "header_info": header_info,
-                
-                # Chromosome distribution
-                "chromosome_distribution": dict(chromosome_stats),
-                
-                # Variant type distribution
-                "variant_type_distribution": dict(variant_type_stats),
-                
-                # Quality statistics
-                "quality_metrics": self._calculate_quality_metrics(quality_scores),
-                
-                # Genomic regions analysis
-                "genomic_regions": self._analyze_genomic_regions(parsed_variants),
-                
-                # All parsed variants for downstream processing
-                "sample_variants": parsed_variants
-            }
-            
-            logger.info(f"VCF analysis complete: {len(variant_lines)} variants, "
-                       f"{len(chromosome_stats)} chromosomes")
-            
-            return metadata
+            parsed_variants = [
+                variant_info for variant_info in map(self._parse_variant_line, sample_variants)
+                if variant_info
+            ]
+            return self._summarize_variants(header_info, parsed_variants, total_variants)
             
         except Exception as e:
             logger.error(f"Error parsing VCF file: {e}")
@@ -327,6 +319,119 @@ class VcfAnalyzer:
                 "message": f"VCF parsing failed: {str(e)}"
             }
     
+    def parse_vcf_file(self, file_path: str, filename: str) -> Dict[str, Any]:
+        """
+        Parse a VCF file on disk, using cyvcf2 (htslib) when it is installed
+        """
+        if cyvcf2 is not None:
+            try:
+                return self._parse_vcf_cyvcf2(file_path)
+            except Exception as e:
+                logger.warning(f"cyvcf2 parsing failed, falling back to text parser: {e}")
+        
+        with open(file_path, 'rb') as f:
+            return self.parse_vcf(f.read(), filename)
+    
+    def _parse_vcf_cyvcf2(self, file_path: str) -> Dict[str, Any]:
+        """Parse with cyvcf2; handles .vcf and .vcf.gz without decompressing in Python"""
+        vcf = cyvcf2.VCF(file_path, lazy=True)
+        try:
+            header_info = self._parse_vcf_header(vcf.raw_header.split('\n'))
+            has_samples = len(vcf.samples) > 0
+            
+            parsed_variants = []
+            total_variants = 0
+            for record in vcf:
+                total_variants += 1
+                if total_variants <= VCF_SAMPLE_SIZE:
+                    parsed_variants.append(self._cyvcf2_record_to_dict(record, has_samples))
+        finally:
+            vcf.close()
+        
+        if not total_variants:
+            return {
+                "status": "error",
+                "message": "No variants found in VCF file"
+            }
+        
+        logger.info(f"Parsed {total_variants} variants from VCF file with cyvcf2")
+        return self._summarize_variants(header_info, parsed_variants, total_variants)
+    
+    def _cyvcf2_record_to_dict(self, record, has_samples: bool) -> Dict[str, Any]:
+        """Convert a cyvcf2 record to the same dict shape as _parse_variant_line"""
+        alt = ','.join(record.ALT) if record.ALT else '.'
+        
+        genotype = None
+        genotype_quality = None
+        if has_samples:
+            alleles = record.genotypes[0]
+            if alleles:
+                separator = '|' if alleles[-1] else '/'
+                genotype = separator.join('.' if a < 0 else str(a) for a in alleles[:-1])
+            gq = record.gt_quals[0]
+            if gq >= 0:
+                genotype_quality = int(gq)
+        
+        return {
+            "chromosome": record.CHROM,
+            "position": record.POS,
+            "id": record.ID,
+            "reference": record.REF,
+            "alternative": alt,
+            "quality": record.QUAL,
+            "filter": record.FILTER or "PASS",
+            "variant_type": self._classify_variant(record.REF, alt),
+            "info": dict(record.INFO),
+            "genotype": genotype,
+            "genotype_quality": genotype_quality
+        }
+    
+    def _summarize_variants(self, header_info: Dict[str, Any], parsed_variants: List[Dict[str, Any]],
+                            total_variants: int) -> Dict[str, Any]:
+        """Build the VCF metadata from the parsed sample of variants"""
+        chromosome_stats = defaultdict(int)
+        variant_type_stats = defaultdict(int)
+        quality_scores = []
+        
+        for variant_info in parsed_variants:
+            chromosome_stats[variant_info['chromosome']] += 1
+            variant_type_stats[variant_info['variant_type']] += 1
+            if variant_info['quality'] is not None:
+                quality_scores.append(variant_info['quality'])
+        
+        # Calculate comprehensive statistics
+        metadata = {
+            "file_type": "VCF",
+            "total_variants": total_variants,
+            "sample_analyzed": len(parsed_variants),
+            "header_info": header_info,
+            
+            # Chromosome distribution
+            "chromosome_distribution": dict(chromosome_stats),
+            
+            # Variant type distribution
+            "variant_type_distribution": dict(variant_type_stats),
+            
+            # Quality statistics
+            "quality_metrics": self._calculate_quality_metrics(quality_scores),
+            
+            # Genomic regions analysis
+            "genomic_regions": self._analyze_genomic_regions(parsed_variants),
+            
+            # All parsed variants for downstream processing
+            "sample_variants": parsed_variants
+        }
+        
+        logger.info(f"VCF analysis complete: {total_variants} variants, "
+                   f"{len(chromosome_stats)} chromosomes")
+        
+        return metadata
+    
+    @staticmethod
+    def _count_records(file_content: bytes, start: int) -> int:
+        """Count data lines from start to EOF in C, without decoding or splitting"""
+        return sum(1 for _ in VCF_DATA_LINE.finditer(file_content, start))
+    
     def _parse_vcf_header(self, lines: List[str]) -> Dict[str, Any]:
         """Parse VCF header information"""
         header_info = {
@@ -444,13 +549,14 @@ class VcfAnalyzer:
         if not quality_scores:
             return {"status": "no_quality_data"}
         
+        qual = np.asarray(quality_scores, dtype=np.float64)
         return {
-            "mean_quality": round(statistics.mean(quality_scores), 2),
-            "median_quality": round(statistics.median(quality_scores), 2),
-            "min_quality": min(quality_scores),
-            "max_quality": max(quality_scores),
-            "high_quality_variants": sum(1 for q in quality_scores if q >= 30),
-            "total_variants_with_quality": len(quality_scores)
+            "mean_quality": round(float(qual.mean()), 2),
+            "median_quality": round(float(np.median(qual)), 2),
+            "min_quality": float(qual.min()),
+            "max_quality": float(qual.max()),
+            "high_quality_variants": int(np.count_nonzero(qual >= 30)),
+            "total_variants_with_quality": int(qual.size)
         }
     
     def _analyze_genomic_regions(self, variants: List[Dict]) -> Dict[str, Any]:
@@ -849,3 +955,71 @@ class GenomicProcessor:
                 "status": "error",
                 "message": f"PRS calculation failed: {str(e)}"
             }
+
+
+# Process pool for CPU-bound parsing, so it runs outside the API process's GIL
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+_worker_processor: Optional[GenomicProcessor] = None
+
+
+def _init_genomic_worker():
+    """Build the analyzers once per worker process instead of once per job"""
+    global _worker_processor
+    _worker_processor = GenomicProcessor()
+
+
+def _parse_worker_count() -> int:
+    """CURAGENIE_PARSE_WORKERS if it is a positive integer, else cpu_count() - 1"""
+    default = max(1, (os.cpu_count() or 2) - 1)
+    raw = os.getenv("CURAGENIE_PARSE_WORKERS", "").strip()
+    if not raw:
+        return default
+    try:
+        workers = int(raw)
+    except ValueError:
+        logger.warning(f"⚠️ Ignoring non-integer CURAGENIE_PARSE_WORKERS={raw!r}, using {default}")
+        return default
+    return workers if workers > 0 else default
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared genomic process pool, sized to leave one core for the API"""
+    global _process_pool
+    if _process_pool is None:
+        # Concurrent background tasks must not each build (and leak) a pool
+        with _process_pool_lock:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=_parse_worker_count(),
+                    initializer=_init_genomic_worker,
+                )
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Stop the genomic pool's worker processes on application shutdown"""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def process_genomic_file_at_path(file_path: str, filename: str) -> Dict[str, Any]:
+    """Read and process a saved genomic file (runs inside a pool worker)"""
+    with open(file_path, "rb") as f:
+        file_content = f.read()
+    return _worker_processor.process_genomic_file(file_content, filename)
+
+
+def parse_vcf_at_path(file_path: str, filename: str) -> Dict[str, Any]:
+    """Parse a saved VCF file (runs inside a pool worker)"""
+    return _worker_processor.vcf_analyzer.parse_vcf_file(file_path, filename)
+
+
+def parse_fastq_at_path(file_path: str, filename: str) -> Dict[str, Any]:
+    """Read and parse a saved FASTQ file (runs inside a pool worker)"""
+    with open(file_path, "rb") as f:
+        file_content = f.read()
+    return _worker_processor.fastq_analyzer.parse_fastq(file_content, filename)
@@ -11,13 +11,9 @@ from pathlib import Path
 # Add the current directory to Python path
 sys.path.append(str(Path(__file__).parent))
 
-# Import all models to ensure they're registered with Base
-from db import models
 from db.database import engine, Base, create_tables
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def init_database():
@@ -25,11 +21,11 @@ def init_database():
     try:
         logger.info("Starting database initialization...")
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        # create_tables() registers every model and runs create_all once
+        create_tables()
         
         logger.info("✅ Database initialized successfully!")
-        logger.info(f"Database file location: {os.path.abspath('curagenie.db') if 'sqlite' in str(engine.url) else 'PostgreSQL database'}")
+        logger.info(f"Database file location: {os.path.abspath('curagenie.db') if engine.dialect.name == 'sqlite' else 'PostgreSQL database'}")
         
         # List all created tables
         table_names = list(Base.metadata.tables.keys())
@@ -42,5 +38,7 @@ def init_database():
         return False
 
 if __name__ == "__main__":
+    # Only configure root logging when run as a script, not on import
+    logging.basicConfig(level=logging.INFO)
     success = init_database()
     sys.exit(0 if success else 1)
@@ -11,11 +11,14 @@ REAL CuraGenie FastAPI Backend with ACTUAL functionality
 import os
 import logging
 import json
+import orjson
 import shutil
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 import sqlite3
 from pathlib import Path
@@ -23,7 +26,10 @@ from fastapi import Depends, Header
 from typing import Optional
 
 # Import our real genomic processing utilities
-from genomic_utils import VcfAnalyzer, FastqAnalyzer, PolygeneticRiskCalculator, GenomicQualityController
+from genomic_utils import (
+    PolygeneticRiskCalculator, get_process_pool, parse_vcf_at_path, parse_fastq_at_path,
+    shutdown_process_pool
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -63,7 +69,8 @@ app = FastAPI(
     description="Real AI-Powered Healthcare Platform with actual genomic processing",
     version="2.0.0-real",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse  # orjson instead of stdlib json for every route
 )
 
 # Add CORS middleware
@@ -84,108 +91,122 @@ app.add_middleware(
 # Database setup (configurable via environment variables)
 DATABASE_PATH = os.getenv("DATABASE_PATH", "/app/data/curagenie_real.db")
 UPLOADS_DIR = Path(os.getenv("UPLOADS_DIR", "uploads"))
+UPLOAD_COPY_BUFFER = 1 << 20  # 1 MiB writes instead of one read of the whole upload
+
+def copy_upload_to_disk(source, file_path: Path) -> int:
+    """Copy an upload's spooled file to disk in 1 MiB chunks and return its size"""
+    source.seek(0)
+    with open(file_path, 'wb') as buffer:
+        shutil.copyfileobj(source, buffer, UPLOAD_COPY_BUFFER)
+        return buffer.tell()
+
 # Ensure parent directory for DB exists if a path is provided
 _db_parent = Path(DATABASE_PATH).parent
 if str(_db_parent) and str(_db_parent) != ".":
     _db_parent.mkdir(parents=True, exist_ok=True)
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Full schema, applied in one executescript() batch so a cold start issues a
+# single round-trip/transaction instead of one per statement.
+SCHEMA_SQL = """
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email TEXT UNIQUE NOT NULL,
+    username TEXT UNIQUE NOT NULL,
+    password TEXT NOT NULL,
+    role TEXT DEFAULT 'patient',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_active BOOLEAN DEFAULT 1
+);
+
+-- Files table with processing status
+CREATE TABLE IF NOT EXISTS uploaded_files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    filename TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    file_size INTEGER,
+    upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    processing_status TEXT DEFAULT 'pending',
+    processing_result TEXT,
+    metadata_json TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+-- PRS Scores table with real calculations
+CREATE TABLE IF NOT EXISTS prs_scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    file_id INTEGER,
+    disease_type TEXT NOT NULL,
+    score REAL NOT NULL,
+    risk_level TEXT NOT NULL,
+    percentile REAL,
+    variants_used INTEGER,
+    confidence REAL,
+    calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (file_id) REFERENCES uploaded_files (id)
+);
+
+-- Timeline events table - REAL events
+CREATE TABLE IF NOT EXISTS timeline_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    event_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    metadata_json TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id)
+);
+
+-- Genomic variants table for browser
+CREATE TABLE IF NOT EXISTS genomic_variants (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    file_id INTEGER,
+    chromosome TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    reference TEXT NOT NULL,
+    alternative TEXT NOT NULL,
+    variant_type TEXT NOT NULL,
+    quality REAL,
+    variant_id TEXT,
+    FOREIGN KEY (user_id) REFERENCES users (id),
+    FOREIGN KEY (file_id) REFERENCES uploaded_files (id)
+);
+
+-- Compound indexes matching the dashboard/browser access paths
+CREATE INDEX IF NOT EXISTS idx_prs_scores_user_disease_calc
+    ON prs_scores (user_id, disease_type, calculated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_genomic_variants_user_chrom_pos
+    ON genomic_variants (user_id, chromosome, position);
+
+COMMIT;
+"""
+
 def init_database():
     """Initialize SQLite database with all required tables"""
     conn = sqlite3.connect(DATABASE_PATH)
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            email TEXT UNIQUE NOT NULL,
-            username TEXT UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            role TEXT DEFAULT 'patient',
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            is_active BOOLEAN DEFAULT 1
-        )
-    """)
-    
-    # Files table with processing status
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS uploaded_files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            filename TEXT NOT NULL,
-            original_filename TEXT NOT NULL,
-            file_type TEXT NOT NULL,
-            file_path TEXT NOT NULL,
-            file_size INTEGER,
-            upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            processing_status TEXT DEFAULT 'pending',
-            processing_result TEXT,
-            metadata_json TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    """)
-    
-    # PRS Scores table with real calculations
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS prs_scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            file_id INTEGER,
-            disease_type TEXT NOT NULL,
-            score REAL NOT NULL,
-            risk_level TEXT NOT NULL,
-            percentile REAL,
-            variants_used INTEGER,
-            confidence REAL,
-            calculated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (file_id) REFERENCES uploaded_files (id)
-        )
-    """)
-    
-    # Timeline events table - REAL events
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS timeline_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            event_type TEXT NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            metadata_json TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    """)
-    
-    # Genomic variants table for browser
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS genomic_variants (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER,
-            file_id INTEGER,
-            chromosome TEXT NOT NULL,
-            position INTEGER NOT NULL,
-            reference TEXT NOT NULL,
-            alternative TEXT NOT NULL,
-            variant_type TEXT NOT NULL,
-            quality REAL,
-            variant_id TEXT,
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            FOREIGN KEY (file_id) REFERENCES uploaded_files (id)
-        )
-    """)
-    
-    conn.commit()
-    conn.close()
+    try:
+        conn.executescript(SCHEMA_SQL)
+    finally:
+        conn.close()
     logger.info("✅ Database initialized with real schema")
 
 # Initialize database on startup
 init_database()
 
-# Initialize real genomic analyzers
-vcf_analyzer = VcfAnalyzer()
-fastq_analyzer = FastqAnalyzer()
+@app.on_event("shutdown")
+def stop_genomic_pool():
+    shutdown_process_pool()
+
+# Initialize real genomic analyzers (VCF/FASTQ parsing runs in the process pool)
 prs_calculator = PolygeneticRiskCalculator()
 
 # Pydantic models
@@ -219,7 +240,7 @@ def create_timeline_event(user_id: int, event_type: str, title: str, description
     """, (user_id, event_type, title, description, json.dumps(metadata) if metadata else None))
     conn.commit()
     conn.close()
-    logger.info(f"📅 Timeline event created: {title}")
+    logger.info("📅 Timeline event created: %s", title)
 
 def authenticate_user(email: str, password: str):
     conn = get_db_connection()
@@ -232,42 +253,44 @@ def authenticate_user(email: str, password: str):
 def process_genomic_file_background(file_path: str, file_id: int, user_id: int, file_type: str):
     """Background task to process genomic files"""
     try:
-        logger.info(f"🧬 Starting real genomic processing for file {file_id}")
-        
-        # Read file content
-        with open(file_path, 'rb') as f:
-            file_content = f.read()
+        logger.info("🧬 Starting real genomic processing for file %s", file_id)
         
         filename = os.path.basename(file_path)
+        # Parsing runs in a worker process that reads the file itself
+        pool = get_process_pool()
         
         # Process based on file type
         if file_type.upper() == 'VCF' or filename.lower().endswith(('.vcf', '.vcf.gz')):
             # Real VCF processing
             logger.info("📊 Processing VCF file with real genomic analysis...")
-            metadata = vcf_analyzer.parse_vcf(file_content, filename)
+            metadata = pool.submit(parse_vcf_at_path, file_path, filename).result()
             
             if metadata.get('status') == 'error':
                 raise Exception(metadata.get('message', 'VCF processing failed'))
             
             # Store variants in database for genome browser
             if 'sample_variants' in metadata:
-                conn = get_db_connection()
-                cursor = conn.cursor()
-                
-                for variant in metadata['sample_variants'][:1000]:  # Store first 1000 variants
-                    cursor.execute("""
-                        INSERT INTO genomic_variants 
-                        (user_id, file_id, chromosome, position, reference, alternative, variant_type, quality, variant_id)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
+                variant_rows = [
+                    (
                         user_id, file_id, variant['chromosome'], variant['position'],
                         variant['reference'], variant['alternative'], variant['variant_type'],
                         variant['quality'], variant.get('id')
-                    ))
+                    )
+                    for variant in metadata['sample_variants'][:1000]  # Store first 1000 variants
+                ]
                 
-                conn.commit()
-                conn.close()
-                logger.info(f"🧬 Stored {len(metadata['sample_variants'])} variants for genome browser")
+                # One executemany in a single transaction instead of a statement per row
+                conn = get_db_connection()
+                try:
+                    conn.executemany("""
+                        INSERT INTO genomic_variants 
+                        (user_id, file_id, chromosome, position, reference, alternative, variant_type, quality, variant_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, variant_rows)
+                    conn.commit()
+                finally:
+                    conn.close()
+                logger.info("🧬 Stored %s variants for genome browser", len(metadata['sample_variants']))
             
             # Calculate REAL PRS scores
             logger.info("🔬 Calculating real PRS scores...")
@@ -276,7 +299,7 @@ def process_genomic_file_background(file_path: str, file_id: int, user_id: int,
         elif file_type.upper() == 'FASTQ' or filename.lower().endswith(('.fastq', '.fq', '.fastq.gz', '.fq.gz')):
             # Real FASTQ processing
             logger.info("📊 Processing FASTQ file with real sequencing analysis...")
-            metadata = fastq_analyzer.parse_fastq(file_content, filename)
+            metadata = pool.submit(parse_fastq_at_path, file_path, filename).result()
             
             if metadata.get('status') == 'error':
                 raise Exception(metadata.get('message', 'FASTQ processing failed'))
@@ -302,7 +325,7 @@ def process_genomic_file_background(file_path: str, file_id: int, user_id: int,
             {'file_id': file_id, 'file_type': file_type}
         )
         
-        logger.info(f"✅ Real genomic processing completed for file {file_id}")
+        logger.info("✅ Real genomic processing completed for file %s", file_id)
         
     except Exception as e:
         logger.error(f"❌ Error processing file {file_id}: {e}")
@@ -323,11 +346,9 @@ def calculate_real_prs_scores(user_id: int, file_id: int, variants: List[Dict]):
     try:
         diseases = ['diabetes', 'alzheimer', 'heart_disease']
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+        prs_rows = []
         for disease in diseases:
-            logger.info(f"🧮 Calculating real PRS for {disease}...")
+            logger.info("🧮 Calculating real PRS for %s...", disease)
             
             # Use real PRS calculator
             prs_result = prs_calculator.calculate_prs(variants, disease)
@@ -349,15 +370,19 @@ def calculate_real_prs_scores(user_id: int, file_id: int, variants: List[Dict]):
             
             percentile = min(99.9, max(0.1, percentile))
             
-            # Store real PRS score
-            cursor.execute("""
+            prs_rows.append((user_id, file_id, disease, score, risk_level, percentile, variants_used, confidence))
+        
+        # Store all real PRS scores in one executemany/commit
+        conn = get_db_connection()
+        try:
+            conn.executemany("""
                 INSERT INTO prs_scores 
                 (user_id, file_id, disease_type, score, risk_level, percentile, variants_used, confidence)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (user_id, file_id, disease, score, risk_level, percentile, variants_used, confidence))
-        
-        conn.commit()
-        conn.close()
+            """, prs_rows)
+            conn.commit()
+        finally:
+            conn.close()
         
         # Create timeline event for PRS calculation
         create_timeline_event(
@@ -366,7 +391,7 @@ def calculate_real_prs_scores(user_id: int, file_id: int, variants: List[Dict]):
             {'diseases': diseases, 'variants_count': len(variants)}
         )
         
-        logger.info(f"✅ Real PRS scores calculated for {len(diseases)} diseases")
+        logger.info("✅ Real PRS scores calculated for %s diseases", len(diseases))
         
     except Exception as e:
         logger.error(f"❌ Error calculating PRS scores: {e}")
@@ -393,6 +418,36 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+# Static payloads are serialized once at import instead of on every request
+ROOT_RESPONSE = orjson.dumps({
+    "message": "🧬 CuraGenie API - REAL VERSION",
+    "version": "2.0.0-real",
+    "status": "healthy",
+    "docs": "/docs",
+    "features": {
+        "real_vcf_processing": True,
+        "real_prs_calculation": True,
+        "real_genome_browser": True,
+        "real_timeline_events": True,
+        "actual_file_analysis": True
+    }
+})
+
+FEATURES_RESPONSE = orjson.dumps({
+    "available_features": {
+        "real_vcf_processing": True,
+        "real_prs_calculation": True,
+        "real_genome_browser": True,
+        "real_timeline_events": True,
+        "actual_genomic_analysis": True,
+        "medical_ai_chatbot": True,
+        "file_background_processing": True
+    },
+    "endpoints_count": 15,
+    "deployment_ready": True,
+    "uses_real_data": True
+})
+
 # API Routes
 @app.get("/test")
 async def test_endpoint():
@@ -400,19 +455,7 @@ async def test_endpoint():
 
 @app.get("/")
 async def root():
-    return {
-        "message": "🧬 CuraGenie API - REAL VERSION",
-        "version": "2.0.0-real",
-        "status": "healthy",
-        "docs": "/docs",
-        "features": {
-            "real_vcf_processing": True,
-            "real_prs_calculation": True,
-            "real_genome_browser": True,
-            "real_timeline_events": True,
-            "actual_file_analysis": True
-        }
-    }
+    return Response(content=ROOT_RESPONSE, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
@@ -446,9 +489,7 @@ async def upload_genomic_file_impl(background_tasks: BackgroundTasks, file: Uplo
         # Save file to disk
         file_path = UPLOADS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
         
-        with open(file_path, 'wb') as buffer:
-            content = await file.read()
-            buffer.write(content)
+        file_size = await run_in_threadpool(copy_upload_to_disk, file.file, file_path)
         
         # Store in database
         conn = get_db_connection()
@@ -457,7 +498,7 @@ async def upload_genomic_file_impl(background_tasks: BackgroundTasks, file: Uplo
             INSERT INTO uploaded_files 
             (user_id, filename, original_filename, file_type, file_path, file_size, processing_status)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (user_id, file_path.name, file.filename, file_type, str(file_path), len(content), 'processing'))
+        """, (user_id, file_path.name, file.filename, file_type, str(file_path), file_size, 'processing'))
         
         file_id = cursor.lastrowid
         conn.commit()
@@ -467,7 +508,7 @@ async def upload_genomic_file_impl(background_tasks: BackgroundTasks, file: Uplo
         create_timeline_event(
             user_id, 'upload', 'File Uploaded',
             f'{file_type} file "{file.filename}" uploaded successfully',
-            {'file_id': file_id, 'file_type': file_type, 'file_size': len(content)}
+            {'file_id': file_id, 'file_type': file_type, 'file_size': file_size}
         )
         
         # Start background processing with REAL genomic analysis
@@ -476,7 +517,7 @@ async def upload_genomic_file_impl(background_tasks: BackgroundTasks, file: Uplo
             str(file_path), file_id, user_id, file_type
         )
         
-        logger.info(f"📁 Real file upload: {file.filename} ({file_type}) - processing started")
+        logger.info("📁 Real file upload: %s (%s) - processing started", file.filename, file_type)
         
         return {
             "id": file_id,
@@ -492,13 +533,13 @@ async def upload_genomic_file_impl(background_tasks: BackgroundTasks, file: Uplo
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 # Frontend compatibility endpoint
-@app.post("/api/local-upload/genomic-data-test")
+@app.post("/api/local-upload/genomic-data-test", status_code=202)
 async def frontend_upload_test(background_tasks: BackgroundTasks, file: UploadFile = File(...),user_id: str = Depends(extract_user_id_from_auth)):
     """Frontend compatibility endpoint for file upload"""
     return await upload_genomic_file_impl(background_tasks, file,user_id)
 
 # REAL file upload with actual processing
-@app.post("/api/upload/genomic")
+@app.post("/api/upload/genomic", status_code=202)
 async def upload_genomic_file(background_tasks: BackgroundTasks,file: UploadFile = File(...),user_id: str = Depends(extract_user_id_from_auth)):
     """REAL genomic file upload with actual VCF/FASTQ processing"""
     return await upload_genomic_file_impl(background_tasks, file, user_id)
@@ -550,7 +591,7 @@ async def get_real_prs_scores(user_id: str):
                 "is_real_data": True
             })
         
-        logger.info(f"📊 Retrieved {len(result)} LATEST PRS scores for user {user_id} (showing only most recent analysis per disease)")
+        logger.info("📊 Retrieved %s LATEST PRS scores for user %s (showing only most recent analysis per disease)", len(result), user_id)
         return result
         
     except Exception as e:
@@ -561,38 +602,38 @@ async def get_real_prs_scores(user_id: str):
 @app.get("/api/timeline/{user_id}")
 async def get_real_timeline(user_id: str):
     """Get REAL timeline events from user's actual activity"""
+    conn = None
     try:
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        # SQLite's JSON1 builds each event object, so stored metadata is spliced
+        # in without re-parsing; the outer ORDER BY fixes the order, which an
+        # aggregate like json_group_array would not guarantee
         cursor.execute("""
-            SELECT id, event_type, title, description, created_at, metadata_json
+            SELECT json_object(
+                'id', id,
+                'title', title,
+                'description', description,
+                'timestamp', created_at,
+                'event_type', event_type,
+                'status', 'completed',
+                'metadata', json(coalesce(metadata_json, '{}')),
+                'is_real_event', json('true')
+            )
             FROM timeline_events 
             WHERE user_id = ?
             ORDER BY created_at DESC
             LIMIT 20
         """, (user_id,))
         
-        events = cursor.fetchall()
-        conn.close()
-        
-        result = []
-        for event in events:
-            metadata = json.loads(event[5]) if event[5] else {}
-            result.append({
-                "id": event[0],
-                "title": event[2],
-                "description": event[3],
-                "timestamp": event[4],
-                "event_type": event[1],
-                "status": "completed",
-                "metadata": metadata,
-                "is_real_event": True
-            })
+        events = [row[0] for row in cursor.fetchall()]
         
-        # Add welcome event if no events exist
-        if not result:
-            result = [{
+        if events:
+            content = "[" + ",".join(events) + "]"
+        else:
+            # Add welcome event if no events exist
+            content = orjson.dumps([{
                 "id": 0,
                 "title": "Welcome to CuraGenie",
                 "description": "Upload your first genomic file to begin analysis",
@@ -601,14 +642,17 @@ async def get_real_timeline(user_id: str):
                 "status": "completed",
                 "metadata": {},
                 "is_real_event": True
-            }]
+            }])
         
-        logger.info(f"📅 Retrieved {len(result)} real timeline events for user {user_id}")
-        return result
+        logger.info("📅 Retrieved %s real timeline events for user %s", len(events) or 1, user_id)
+        return Response(content=content, media_type="application/json")
         
     except Exception as e:
         logger.error(f"❌ Error getting timeline: {e}")
-        return []
+        return Response(content=b"[]", media_type="application/json")
+    finally:
+        if conn is not None:
+            conn.close()
 
 # REAL dashboard stats from actual data
 @app.get("/api/direct/dashboard-stats/user/{user_id}")
@@ -715,7 +759,9 @@ async def get_real_genomic_variants(user_id: str, chromosome: str = None, start:
         
         # Only return real data - no mock data
         
-        logger.info(f"🧬 Retrieved {len(result)} {'real' if result and result[0].get('is_real_data', True) else 'sample'} variants for genome browser")
+        if logger.isEnabledFor(logging.INFO):
+            data_kind = 'real' if result and result[0].get('is_real_data', True) else 'sample'
+            logger.info("🧬 Retrieved %s %s variants for genome browser", len(result), data_kind)
         return result
         
     except Exception as e:
@@ -829,7 +875,7 @@ async def get_genome_browser_data(user_id: str):
             "data_source": "analyzed_vcf_files"
         }
         
-        logger.info(f"🧬 Retrieved genome browser data: {len(processed_variants)} variants across {len(chromosome_counts)} chromosomes")
+        logger.info("🧬 Retrieved genome browser data: %s variants across %s chromosomes", len(processed_variants), len(chromosome_counts))
         return result
         
     except Exception as e:
@@ -921,10 +967,11 @@ async def real_chatbot(message: dict,user_id: str = Depends(extract_user_id_from
         }
 
 # Authentication endpoints
+# Plain def: credential checks and sqlite calls block, so FastAPI runs these in its threadpool
 from fastapi import HTTPException
 
 @app.post("/api/auth/login", response_model=Token)
-async def login(credentials: UserLogin):
+def login(credentials: UserLogin):
     user = authenticate_user(credentials.email, credentials.password)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
@@ -940,7 +987,7 @@ async def login(credentials: UserLogin):
 
 # Registration endpoint
 @app.post("/api/auth/register", response_model=Token)
-async def register(user: UserLogin):  # You can also define a UserCreate schema if you want
+def register(user: UserLogin):  # You can also define a UserCreate schema if you want
     conn = get_db_connection()
     cursor = conn.cursor()
 
@@ -968,7 +1015,7 @@ async def register(user: UserLogin):  # You can also define a UserCreate schema
     )
 
 @app.get("/api/auth/me")
-async def get_current_user(user_id: str = Depends(extract_user_id_from_auth)):
+def get_current_user(user_id: str = Depends(extract_user_id_from_auth)):
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, email, username, role, is_active FROM users WHERE id = ?", (user_id,))
@@ -987,20 +1034,7 @@ async def get_current_user(user_id: str = Depends(extract_user_id_from_auth)):
 # Other essential endpoints
 @app.get("/api/features")
 async def get_api_features():
-    return {
-        "available_features": {
-            "real_vcf_processing": True,
-            "real_prs_calculation": True, 
-            "real_genome_browser": True,
-            "real_timeline_events": True,
-            "actual_genomic_analysis": True,
-            "medical_ai_chatbot": True,
-            "file_background_processing": True
-        },
-        "endpoints_count": 15,
-        "deployment_ready": True,
-        "uses_real_data": True
-    }
+    return Response(content=FEATURES_RESPONSE, media_type="application/json")
 
 @app.post("/api/auth/logout")
 async def logout():
@@ -3,6 +3,8 @@ from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
+from schemas.schemas import ORM_MODE
+
 class UserRole(str, Enum):
     PATIENT = "patient"
     DOCTOR = "doctor"
@@ -45,6 +47,9 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    role: Optional[str] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
 
 class User(BaseModel):
     id: int
@@ -55,8 +60,7 @@ class User(BaseModel):
     is_verified: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 # Patient Profile Schemas
 class PatientProfileCreate(BaseModel):
@@ -103,8 +107,7 @@ class PatientProfile(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 # Medical Report Schemas
 class MedicalReportCreate(BaseModel):
@@ -127,8 +130,7 @@ class MedicalReport(BaseModel):
     status: str
     generated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 # Combined User with Profile
 class UserWithProfile(BaseModel):
@@ -141,8 +143,7 @@ class UserWithProfile(BaseModel):
     created_at: datetime
     profile: Optional[PatientProfile] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 # Dashboard Data
 class UserDashboard(BaseModel):
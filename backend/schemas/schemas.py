@@ -1,7 +1,11 @@
-from pydantic import BaseModel
+import json
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+# Shared by every schema that is built from ORM objects
+ORM_MODE = ConfigDict(from_attributes=True)
+
 class GenomicDataBase(BaseModel):
     user_id: str
     filename: str
@@ -15,8 +19,15 @@ class GenomicDataResponse(GenomicDataBase):
     status: str
     metadata_json: Dict[str, Any] = {}
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
+    
+    @field_validator("metadata_json", mode="before")
+    @classmethod
+    def parse_metadata_json(cls, value):
+        # The column stores the JSON text
+        if isinstance(value, str):
+            return json.loads(value) if value else {}
+        return value
 
 class UploadResponse(BaseModel):
     id: int
@@ -34,8 +45,7 @@ class PrsScoreResponse(PrsScoreBase):
     id: int
     score: float
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 class PrsCalculationRequest(BaseModel):
     genomic_data_id: int
@@ -53,8 +63,7 @@ class MlPredictionResponse(MlPredictionBase):
     prediction: str
     confidence: float
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 class MlInferenceRequest(BaseModel):
     user_id: str
@@ -87,8 +96,7 @@ class MRIAnalysisResponse(MRIAnalysisBase):
     analysis_started_at: Optional[datetime] = None
     analysis_completed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ORM_MODE
 
 class MRIUploadResponse(BaseModel):
     id: int
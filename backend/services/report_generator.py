@@ -1,4 +1,4 @@
-import json
+import orjson
 import logging
 from typing import Dict, Any, List
 from datetime import datetime
@@ -20,15 +20,15 @@ class ReportGenerator:
         """Generate a comprehensive medical report for a user's genomic data"""
         
         try:
-            # Get user and profile
-            user = db.query(User).filter(User.id == user_id).first()
+            # Get user and profile (db.get serves already-loaded rows from the identity map)
+            user = db.get(User, user_id)
             if not user:
                 return {"status": "error", "message": "User not found"}
                 
             profile = db.query(PatientProfile).filter(PatientProfile.user_id == user_id).first()
             
             # Get genomic data
-            genomic_data = db.query(GenomicData).filter(GenomicData.id == genomic_data_id).first()
+            genomic_data = db.get(GenomicData, genomic_data_id)
             if not genomic_data:
                 return {"status": "error", "message": "Genomic data not found"}
             
@@ -66,7 +66,7 @@ class ReportGenerator:
                 genomic_data_id=genomic_data_id,
                 report_title=f"Comprehensive Genomic Analysis - {genomic_data.filename}",
                 report_type="comprehensive_genomic",
-                report_data=json.dumps(report_data),
+                report_data=orjson.dumps(report_data, option=orjson.OPT_NON_STR_KEYS).decode(),
                 summary=self._generate_summary(report_data),
                 recommendations=self._format_recommendations(report_data["recommendations"]),
                 status="completed"
@@ -125,7 +125,7 @@ class ReportGenerator:
         
         # Parse metadata
         try:
-            metadata = json.loads(genomic_data.metadata_json) if genomic_data.metadata_json else {}
+            metadata = orjson.loads(genomic_data.metadata_json) if genomic_data.metadata_json else {}
             summary["file_size"] = metadata.get("file_size_bytes")
             summary["upload_method"] = metadata.get("upload_method")
         except:
@@ -0,0 +1,72 @@
+"""
+Shared fixtures: a throwaway SQLite database and an in-process fake Redis
+"""
+import os
+import sys
+import tempfile
+
+# Configure before any app module reads Settings or builds the engine
+_TEST_DB_DIR = tempfile.mkdtemp(prefix="curagenie-test-")
+os.environ["ENV_FILE"] = ""  # never pick up a developer's .env
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TEST_DB_DIR, 'test.db')}"
+os.environ["DATABASE_PATH"] = os.path.join(_TEST_DB_DIR, "main.db")  # main.py's SQLite file
+os.environ["UPLOADS_DIR"] = os.path.join(_TEST_DB_DIR, "uploads")
+os.environ["SECRET_KEY"] = "test-secret-key"
+os.environ["DEBUG"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakeredis
+import pytest
+
+from core import rate_limit, redis_client
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point get_redis() at a fresh fake server"""
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis_client, "_redis_client", client)
+    monkeypatch.setattr(redis_client, "_redis_retry_at", 0.0)
+    # The Lua script is registered against a specific client
+    monkeypatch.setattr(rate_limit, "_token_bucket_script", None)
+    return client
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    """Simulate a deployment where Redis is unreachable"""
+    monkeypatch.setattr(redis_client, "get_redis", lambda: None)
+    for module_name in ("core.auth", "core.rate_limit"):
+        monkeypatch.setattr(f"{module_name}.get_redis", lambda: None)
+
+
+@pytest.fixture
+def db_session():
+    """Fresh tables per test on the temporary SQLite database"""
+    from db.database import Base, SessionLocal, engine
+    import db.models  # noqa: F401  (registers the genomic tables referenced by users)
+    import db.auth_models  # noqa: F401
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def auth_client(db_session, fake_redis):
+    """TestClient for an app with only the auth router mounted"""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from api.auth import router
+    from core import auth
+
+    # The per-process token cache would otherwise leak tokens between tests
+    auth._token_cache.clear()
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+    auth._token_cache.clear()
@@ -0,0 +1,168 @@
+"""
+Auth flows against the real router and a temporary SQLite database
+"""
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+from fastapi import Depends
+from passlib.hash import bcrypt
+
+from core import auth
+from db.auth_models import User, UserRole
+
+
+def register(client, email="pat@example.com", username="pat", password="correct horse", role="patient"):
+    response = client.post("/api/auth/register", json={
+        "email": email, "username": username, "password": password, "role": role,
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def login(client, email="pat@example.com", password="correct horse"):
+    response = client.post("/api/auth/login", json={"email": email, "password": password})
+    assert response.status_code == 200, response.text
+    return response.json()["access_token"]
+
+
+def bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Shift core.auth's wall clock forward without touching token timestamps"""
+    offset = {"s": 0.0}
+    real_time = time.time
+    monkeypatch.setattr(auth.time, "time", lambda: real_time() + offset["s"])
+    return offset
+
+
+def test_register_login_me(auth_client):
+    register(auth_client)
+    token = login(auth_client)
+    response = auth_client.get("/api/auth/me", headers=bearer(token))
+    assert response.status_code == 200
+    assert response.json()["email"] == "pat@example.com"
+
+
+def test_bad_password_is_rejected(auth_client):
+    register(auth_client)
+    response = auth_client.post("/api/auth/login", json={"email": "pat@example.com", "password": "wrong"})
+    assert response.status_code == 401
+
+
+def test_token_cache_skips_decode_until_ttl(auth_client, monkeypatch, clock):
+    register(auth_client)
+    token = login(auth_client)
+
+    calls = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(auth.jwt, "decode", lambda *a, **kw: calls.append(1) or real_decode(*a, **kw))
+
+    auth_client.get("/api/auth/me", headers=bearer(token))
+    auth_client.get("/api/auth/me", headers=bearer(token))
+    assert len(calls) == 1
+
+    clock["s"] = auth.TOKEN_CACHE_TTL_SECONDS + 1
+    assert auth_client.get("/api/auth/me", headers=bearer(token)).status_code == 200
+    assert len(calls) == 2
+
+
+def test_expired_token_is_rejected(auth_client):
+    register(auth_client)
+    expired = auth.create_access_token({"sub": "pat@example.com"}, expires_delta=timedelta(seconds=-1))
+    assert auth_client.get("/api/auth/me", headers=bearer(expired)).status_code == 401
+
+
+def test_delete_account_blocks_further_use(auth_client):
+    register(auth_client)
+    token = login(auth_client)
+    response = auth_client.delete("/api/auth/delete-account", params={"password": "correct horse"}, headers=bearer(token))
+    assert response.status_code == 200
+    auth._token_cache.clear()
+    assert auth_client.get("/api/auth/me", headers=bearer(token)).status_code == 400
+
+
+@pytest.fixture
+def patient_only_client(auth_client):
+    """The auth app plus a route guarded by get_current_active_patient"""
+    app = auth_client.app
+
+    @app.get("/patient-only")
+    def patient_only(user: User = Depends(auth.get_current_active_patient)):
+        return {"id": user.id}
+
+    return auth_client
+
+
+def test_role_prefilter_rejects_before_user_lookup(patient_only_client, monkeypatch):
+    register(patient_only_client, email="doc@example.com", username="doc", role="doctor")
+    token = login(patient_only_client, email="doc@example.com")
+
+    lookups = []
+    monkeypatch.setattr(auth, "get_user_by_email", lambda db, email: lookups.append(email))
+    response = patient_only_client.get("/patient-only", headers=bearer(token))
+    assert response.status_code == 403
+    assert lookups == []
+
+
+def test_role_check_admits_patient(patient_only_client):
+    register(patient_only_client)
+    token = login(patient_only_client)
+    assert patient_only_client.get("/patient-only", headers=bearer(token)).status_code == 200
+
+
+def test_role_check_without_claim_falls_back_to_user_role(patient_only_client):
+    register(patient_only_client, email="doc@example.com", username="doc", role="doctor")
+    # Tokens issued before the role claim existed carry only sub
+    token = auth.create_access_token({"sub": "doc@example.com"})
+    assert patient_only_client.get("/patient-only", headers=bearer(token)).status_code == 403
+
+
+def test_logout_revokes_token(auth_client):
+    register(auth_client)
+    token = login(auth_client)
+    assert auth_client.get("/api/auth/me", headers=bearer(token)).status_code == 200
+
+    assert auth_client.post("/api/auth/logout", headers=bearer(token)).status_code == 200
+    assert auth_client.get("/api/auth/me", headers=bearer(token)).status_code == 401
+
+
+def test_logout_fails_visibly_without_redis(auth_client, no_redis):
+    register(auth_client)
+    token = login(auth_client)
+    response = auth_client.post("/api/auth/logout", headers=bearer(token))
+    assert response.status_code == 503
+
+
+def test_login_rehashes_legacy_bcrypt_hash(auth_client, db_session):
+    db_session.add(User(
+        email="old@example.com", username="old",
+        hashed_password=bcrypt.using(rounds=4).hash("legacy pass"), role=UserRole.PATIENT,
+    ))
+    db_session.commit()
+
+    login(auth_client, email="old@example.com", password="legacy pass")
+
+    db_session.expire_all()
+    stored = db_session.query(User.hashed_password).filter(User.email == "old@example.com").scalar()
+    assert stored.startswith("$argon2id$")
+    # And the upgraded hash still logs in
+    login(auth_client, email="old@example.com", password="legacy pass")
+
+
+def test_duplicate_email_and_username_are_rejected(auth_client):
+    register(auth_client)
+    response = auth_client.post("/api/auth/register", json={
+        "email": "pat@example.com", "username": "other", "password": "x" * 10,
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+    response = auth_client.post("/api/auth/register", json={
+        "email": "other@example.com", "username": "pat", "password": "x" * 10,
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already taken"
@@ -0,0 +1,113 @@
+"""
+Direct-SQL latest PRS endpoint: Redis payload cache and ETag revalidation
+"""
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import direct_prs
+
+URL = "/api/direct/prs/user/u1"
+
+
+@pytest.fixture
+def prs_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "direct.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE genomic_data (id INTEGER PRIMARY KEY, user_id TEXT, filename TEXT,
+                                   status TEXT, uploaded_at TEXT);
+        CREATE TABLE prs_scores (id INTEGER PRIMARY KEY, genomic_data_id INTEGER,
+                                 disease_type TEXT, score REAL, calculated_at TEXT);
+        INSERT INTO genomic_data VALUES (1, 'u1', 'a.vcf', 'completed', '2024-01-01');
+        INSERT INTO prs_scores VALUES (1, 1, 'diabetes', 0.4, '2024-01-01');
+        INSERT INTO prs_scores VALUES (2, 1, 'diabetes', 0.6, '2024-01-02');
+        INSERT INTO prs_scores VALUES (3, 1, 'alzheimer', 0.2, '2024-01-02');
+    """)
+    conn.close()
+
+    opened = []
+
+    def connect():
+        conn = sqlite3.connect(path)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(direct_prs, "get_database_connection", connect)
+    return path, opened
+
+
+@pytest.fixture
+def prs_client():
+    app = FastAPI()
+    app.include_router(direct_prs.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def assert_all_closed(opened):
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_returns_latest_score_per_disease(prs_client, prs_db, fake_redis):
+    response = prs_client.get(URL)
+    assert response.status_code == 200
+    assert [(s["disease_type"], s["id"], s["score"]) for s in response.json()] == [
+        ("alzheimer", 3, 0.2), ("diabetes", 2, 0.6),
+    ]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert_all_closed(prs_db[1])
+
+
+def test_matching_etag_gets_304(prs_client, prs_db, fake_redis):
+    etag = prs_client.get(URL).headers["ETag"]
+    response = prs_client.get(URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert_all_closed(prs_db[1])
+
+
+def test_new_score_changes_etag_and_body(prs_client, prs_db, fake_redis):
+    first = prs_client.get(URL)
+    conn = sqlite3.connect(prs_db[0])
+    conn.execute("INSERT INTO prs_scores VALUES (4, 1, 'diabetes', 0.9, '2024-01-03')")
+    conn.commit()
+    conn.close()
+
+    response = prs_client.get(URL, headers={"If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert {s["disease_type"]: s["score"] for s in response.json()}["diabetes"] == 0.9
+
+
+def test_repeat_reads_come_from_redis(prs_client, prs_db, fake_redis):
+    body = prs_client.get(URL).content
+    assert len(fake_redis.keys("prs:u1:*")) == 1
+
+    # Scores edited in place keep the same version key, so the cached body is served
+    conn = sqlite3.connect(prs_db[0])
+    conn.execute("UPDATE prs_scores SET score = 0.99")
+    conn.commit()
+    conn.close()
+    assert prs_client.get(URL).content == body
+    assert_all_closed(prs_db[1])
+
+
+def test_works_without_redis(prs_client, prs_db, monkeypatch):
+    monkeypatch.setattr(direct_prs, "get_redis", lambda: None)
+    assert prs_client.get(URL).status_code == 200
+    assert prs_client.get(URL).status_code == 200
+
+
+def test_database_errors_close_the_connection(prs_client, prs_db, fake_redis):
+    conn = sqlite3.connect(prs_db[0])
+    conn.execute("DROP TABLE prs_scores")
+    conn.close()
+    response = prs_client.get(URL)
+    assert response.status_code == 500
+    assert_all_closed(prs_db[1])
@@ -0,0 +1,44 @@
+"""
+Feedback submission validation (api.feedback)
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.feedback import router
+
+VALID = {"feedback_type": "bug_report", "message": "The upload page hangs", "rating": 4}
+
+
+@pytest.fixture
+def feedback_client():
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_valid_feedback_is_accepted(feedback_client):
+    response = feedback_client.post("/api/feedback/submit", json=VALID)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["success"] is True
+    assert body["feedback_id"].startswith("FB_")
+
+
+def test_rating_and_email_are_optional(feedback_client):
+    payload = {"feedback_type": "general_feedback", "message": "Nice dashboard overall"}
+    assert feedback_client.post("/api/feedback/submit", json=payload).status_code == 200
+
+
+@pytest.mark.parametrize("change", [
+    {"feedback_type": "complaint"},
+    {"rating": 0},
+    {"rating": 6},
+    {"message": "too short"},
+    {"message": "   padded    "},  # under 10 characters once stripped
+    {"email": "not-an-email"},
+])
+def test_invalid_feedback_is_a_422(feedback_client, change):
+    response = feedback_client.post("/api/feedback/submit", json={**VALID, **change})
+    assert response.status_code == 422
@@ -0,0 +1,104 @@
+"""
+VCF and FASTQ parsing in genomic_utils, on small in-memory files
+"""
+import pytest
+
+import genomic_utils
+from genomic_utils import FastqAnalyzer, VcfAnalyzer
+
+VCF_HEADER = (
+    b"##fileformat=VCFv4.2\n"
+    b"##reference=GRCh38\n"
+    b"#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n"
+)
+
+
+def vcf_line(chrom, pos, qual="50", ref="A", alt="G"):
+    return f"{chrom}\t{pos}\t.\t{ref}\t{alt}\t{qual}\tPASS\tDP=10\n".encode()
+
+
+def fastq_read(name, seq, qual_char="I"):
+    return f"@{name}\n{seq}\n+\n{qual_char * len(seq)}\n".encode()
+
+
+def test_vcf_quality_metrics():
+    content = VCF_HEADER + vcf_line("chr1", 100, "10") + vcf_line("chr1", 200, "30") + vcf_line("chr2", 5, "50")
+    result = VcfAnalyzer().parse_vcf(content, "sample.vcf")
+
+    quality = result["quality_metrics"]
+    assert quality["mean_quality"] == 30.0
+    assert quality["median_quality"] == 30.0
+    assert quality["min_quality"] == 10.0
+    assert quality["max_quality"] == 50.0
+    assert quality["high_quality_variants"] == 2
+    assert quality["total_variants_with_quality"] == 3
+    assert all(type(value) in (int, float) for value in quality.values())
+
+
+def test_vcf_without_qualities_reports_no_quality_data():
+    result = VcfAnalyzer().parse_vcf(VCF_HEADER + vcf_line("chr1", 100, "."), "sample.vcf")
+    assert result["quality_metrics"] == {"status": "no_quality_data"}
+
+
+def test_fastq_quality_scores():
+    # 'I' is Phred 40, '+' is Phred 10
+    content = fastq_read("r1", "ACGT") + fastq_read("r2", "GGCC", qual_char="+") + fastq_read("r3", "AC")
+    result = FastqAnalyzer().parse_fastq(content, "reads.fastq")
+
+    quality = result["quality_metrics"]
+    assert quality["mean_quality"] == 28.0
+    assert quality["median_quality"] == 40.0
+    assert quality["quality_distribution"] == {
+        "high_quality_percent": 60.0,
+        "medium_quality_percent": 0.0,
+        "low_quality_percent": 40.0,
+    }
+    # Positions past the shorter read average only the reads that reach them
+    assert quality["per_position_quality"] == {0: 30.0, 1: 30.0, 2: 25.0, 3: 25.0}
+    assert all(type(value) is float for value in quality["per_position_quality"].values())
+
+
+def test_vcf_total_counts_only_data_lines():
+    content = (
+        VCF_HEADER + vcf_line("chr1", 100) + b"\n" + vcf_line("chr1", 200)
+        + b"  \n#stray comment\n" + vcf_line("chr2", 5).replace(b"\n", b"\r\n") + b"\r\n\n"
+    )
+    result = VcfAnalyzer().parse_vcf(content, "sample.vcf")
+    assert result["total_variants"] == 3
+    assert result["sample_analyzed"] == 3
+    assert result["header_info"]["reference_genome"] == "GRCh38"
+
+
+@pytest.mark.parametrize("sample_size", [1, 2, 3])
+def test_vcf_total_past_the_sample_matches_full_parse(monkeypatch, sample_size):
+    # Records past the sample are counted, not parsed, and must agree
+    monkeypatch.setattr(genomic_utils, "VCF_SAMPLE_SIZE", sample_size)
+    content = (
+        VCF_HEADER + vcf_line("chr1", 100) + vcf_line("chr1", 200) + b"\n \n#stray\n"
+        + vcf_line("chr2", 5) + vcf_line("chrX", 7).rstrip(b"\n")
+    )
+    result = VcfAnalyzer().parse_vcf(content, "sample.vcf")
+    assert result["total_variants"] == 4
+    assert result["sample_analyzed"] == sample_size
+
+
+def test_vcf_without_data_lines_is_an_error():
+    result = VcfAnalyzer().parse_vcf(VCF_HEADER + b"\n#only comments\n", "sample.vcf")
+    assert result["status"] == "error"
+
+
+@pytest.mark.parametrize("trailer", [b"", b"\n", b"\r\n\n"])
+def test_fastq_total_past_the_sample_is_counted(monkeypatch, trailer):
+    monkeypatch.setattr(genomic_utils, "FASTQ_SAMPLE_SIZE", 2)
+    content = b"".join(fastq_read(f"r{i}", "ACGTAC") for i in range(5)).rstrip(b"\n") + trailer
+    result = FastqAnalyzer().parse_fastq(content, "reads.fastq")
+    assert result["total_sequences"] == 5
+    assert result["sample_analyzed"] == 2
+
+
+def test_fastq_smaller_than_sample_counts_parsed_reads():
+    content = fastq_read("r1", "ACGT") + fastq_read("r2", "GGCC")
+    result = FastqAnalyzer().parse_fastq(content, "reads.fastq")
+    assert result["total_sequences"] == 2
+    assert result["sample_analyzed"] == 2
+    assert [read["id"] for read in result["sample_sequences"]] == ["r1", "r2"]
@@ -0,0 +1,62 @@
+"""
+Per-user genomic data listing in api.local_upload
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from db.models import GenomicData
+
+
+@pytest.fixture
+def upload_client(db_session, tmp_path, monkeypatch):
+    # The module creates its uploads/ directory relative to the cwd on import
+    monkeypatch.chdir(tmp_path)
+    from api.local_upload import router
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def records(db_session):
+    """Five records for u1 interleaved with another user's"""
+    ids = []
+    for i in range(5):
+        mine = GenomicData(user_id="u1", filename=f"f{i}.vcf", file_url=f"uploads/f{i}.vcf", status="completed")
+        db_session.add_all([mine, GenomicData(user_id="u2", filename="x.vcf", file_url="x", status="completed")])
+        db_session.flush()
+        ids.append(mine.id)
+    db_session.commit()
+    return ids
+
+
+def listing(client, **params):
+    response = client.get("/api/local-upload/genomic-data/user/u1", params=params)
+    assert response.status_code == 200, response.text
+    return [record["id"] for record in response.json()], response.headers.get("X-Next-Cursor")
+
+
+def test_unpaginated_listing_returns_everything(upload_client, records):
+    assert listing(upload_client) == (records, None)
+
+
+def test_keyset_pages_follow_the_cursor(upload_client, records):
+    page, cursor = listing(upload_client, limit=2)
+    assert (page, cursor) == (records[:2], str(records[1]))
+    page, cursor = listing(upload_client, after=cursor, limit=2)
+    assert (page, cursor) == (records[2:4], str(records[3]))
+    # A short last page has no cursor
+    assert listing(upload_client, after=cursor, limit=2) == (records[4:], None)
+
+
+def test_after_without_limit_uses_the_default_page_size(upload_client, records, monkeypatch):
+    monkeypatch.setattr("api.local_upload.PAGE_SIZE_DEFAULT", 3)
+    assert listing(upload_client, after=records[0]) == (records[1:4], str(records[3]))
+
+
+def test_limit_is_bounded(upload_client):
+    response = upload_client.get("/api/local-upload/genomic-data/user/u1", params={"limit": 501})
+    assert response.status_code == 422
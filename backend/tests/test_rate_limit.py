@@ -0,0 +1,58 @@
+"""
+Token bucket rate limiter (core.rate_limit.TokenBucket)
+"""
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from core.rate_limit import TokenBucket
+
+
+def make_request(host="10.0.0.1", path="/api/auth/login"):
+    return SimpleNamespace(client=SimpleNamespace(host=host), url=SimpleNamespace(path=path))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock for the bucket's refill arithmetic"""
+    now = {"t": 1_700_000_000.0}
+    monkeypatch.setattr("core.rate_limit.time.time", lambda: now["t"])
+    return now
+
+
+def test_allows_up_to_capacity(fake_redis, clock):
+    bucket = TokenBucket(capacity=3, refill_per_second=1 / 60)
+    for _ in range(3):
+        bucket(make_request())
+
+
+def test_denies_when_empty(fake_redis, clock):
+    bucket = TokenBucket(capacity=2, refill_per_second=1 / 60)
+    bucket(make_request())
+    bucket(make_request())
+    with pytest.raises(HTTPException) as exc_info:
+        bucket(make_request())
+    assert exc_info.value.status_code == 429
+
+
+def test_refills_over_time(fake_redis, clock):
+    bucket = TokenBucket(capacity=1, refill_per_second=1.0)
+    bucket(make_request())
+    with pytest.raises(HTTPException):
+        bucket(make_request())
+    clock["t"] += 1.0
+    bucket(make_request())
+
+
+def test_buckets_are_per_client_and_path(fake_redis, clock):
+    bucket = TokenBucket(capacity=1, refill_per_second=1 / 60)
+    bucket(make_request(host="10.0.0.1"))
+    bucket(make_request(host="10.0.0.2"))
+    bucket(make_request(path="/api/auth/register"))
+
+
+def test_fails_open_without_redis(no_redis, clock):
+    bucket = TokenBucket(capacity=1, refill_per_second=1 / 60)
+    for _ in range(5):
+        bucket(make_request())
@@ -0,0 +1,110 @@
+"""
+User timelines: the modular /api/timeline router and main.py's SQLite timeline
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from db.models import GenomicData, MlPrediction, PrsScore
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def timeline_client(db_session):
+    from api.timeline import router
+
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_timeline_merges_sources_newest_first(timeline_client, db_session):
+    old_upload = GenomicData(user_id="u1", filename="old.vcf", status="completed", uploaded_at=T0)
+    new_upload = GenomicData(user_id="u1", filename="new.fastq", status="processing",
+                             uploaded_at=T0 + timedelta(days=2))
+    db_session.add_all([old_upload, new_upload])
+    db_session.flush()
+    db_session.add_all([
+        PrsScore(genomic_data_id=old_upload.id, disease_type="diabetes", score=0.8,
+                 calculated_at=T0 + timedelta(days=1)),
+        MlPrediction(user_id="u1", prediction="low risk", confidence=0.9),
+        # Another user's rows stay out
+        GenomicData(user_id="u2", filename="theirs.vcf", uploaded_at=T0 + timedelta(days=3)),
+        MlPrediction(user_id="u2", prediction="theirs", confidence=0.1),
+    ])
+    db_session.commit()
+
+    events = timeline_client.get("/api/timeline/u1").json()
+    # Predictions have no timestamp and are stamped "now", so they lead
+    assert [event["id"].split("_")[0] for event in events] == ["ml", "upload", "prs", "upload"]
+    assert [events[1]["id"], events[3]["id"]] == [f"upload_{new_upload.id}", f"upload_{old_upload.id}"]
+    assert events[0]["metadata"] == {"analysis_type": "ML", "prediction": "low risk", "confidence": 0.9}
+    assert events[1]["status"] == "in-progress"
+    assert events[1]["metadata"]["file_type"] == "FASTQ"
+    assert events[2]["metadata"]["severity"] == "high"
+    assert events[3]["status"] == "completed"
+
+
+def test_timeline_without_activity_is_a_welcome_milestone(timeline_client):
+    events = timeline_client.get("/api/timeline/nobody").json()
+    assert [event["id"] for event in events] == ["welcome"]
+
+
+@pytest.fixture
+def main_app():
+    """main.py's app, on the temporary SQLite file from conftest"""
+    import main
+
+    conn = main.get_db_connection()
+    conn.execute("DELETE FROM timeline_events")
+    conn.commit()
+    conn.close()
+    with TestClient(main.app) as client:
+        yield main, client
+
+
+def add_main_event(main, user_id, title, created_at, metadata_json=None):
+    conn = main.get_db_connection()
+    conn.execute(
+        "INSERT INTO timeline_events (user_id, event_type, title, description, created_at, metadata_json) "
+        "VALUES (?, 'upload', ?, 'desc', ?, ?)",
+        (user_id, title, created_at, metadata_json),
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_main_timeline_lists_latest_twenty_newest_first(main_app):
+    main, client = main_app
+    for day in range(1, 26):
+        add_main_event(main, 7, f"event {day}", f"2024-01-{day:02d} 00:00:00")
+    add_main_event(main, 8, "someone else", "2024-02-01 00:00:00")
+
+    response = client.get("/api/timeline/7")
+    assert response.headers["content-type"] == "application/json"
+    events = response.json()
+    assert [event["title"] for event in events] == [f"event {day}" for day in range(25, 5, -1)]
+    assert events[0]["is_real_event"] is True
+    assert events[0]["status"] == "completed"
+
+
+def test_main_timeline_splices_stored_metadata_as_objects(main_app):
+    main, client = main_app
+    add_main_event(main, 7, "with metadata", "2024-01-02 00:00:00", '{"file_id": 3, "tags": ["vcf"]}')
+    add_main_event(main, 7, "without metadata", "2024-01-01 00:00:00")
+
+    events = client.get("/api/timeline/7").json()
+    assert events[0]["metadata"] == {"file_id": 3, "tags": ["vcf"]}
+    assert events[1]["metadata"] == {}
+
+
+def test_main_timeline_without_events_is_a_welcome_event(main_app):
+    main, client = main_app
+    response = client.get("/api/timeline/7")
+    assert response.headers["content-type"] == "application/json"
+    events = response.json()
+    assert [(event["id"], event["event_type"]) for event in events] == [(0, "welcome")]
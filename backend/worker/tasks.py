@@ -1,10 +1,11 @@
+import functools
 import time
 import hashlib
 import logging
 import pickle
 import os
 import io
-import json
+import orjson
 from io import BytesIO
 from datetime import datetime
 import boto3
@@ -26,13 +27,15 @@ from genomic_utils import GenomicProcessor
 
 logger = logging.getLogger(__name__)
 
-# Initialize S3 client
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=settings.aws_access_key_id,
-    aws_secret_access_key=settings.aws_secret_access_key,
-    region_name=settings.aws_region
-)
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    """Create the S3 client on first use instead of at import time"""
+    return boto3.client(
+        's3',
+        aws_access_key_id=settings.aws_access_key_id,
+        aws_secret_access_key=settings.aws_secret_access_key,
+        region_name=settings.aws_region
+    )
 
 # Load ML models at startup (for efficiency)
 DIABETES_MODEL = None
@@ -118,7 +121,7 @@ def process_genomic_file(self, genomic_data_id: int):
         
         # Download file from S3
         try:
-            response = s3_client.get_object(Bucket=settings.s3_bucket_name, Key=genomic_data.file_url)
+            response = get_s3_client().get_object(Bucket=settings.s3_bucket_name, Key=genomic_data.file_url)
             file_content = response['Body'].read()
             file_size = len(file_content)
             logger.info(f"Downloaded file {genomic_data.filename}, size: {file_size} bytes")
@@ -156,7 +159,10 @@ def process_genomic_file(self, genomic_data_id: int):
         
         # Update database record
         genomic_data.status = "completed"
-        genomic_data.metadata_json = json.dumps(metadata) if isinstance(metadata, dict) else str(metadata)
+        genomic_data.metadata_json = (
+            orjson.dumps(metadata, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+            if isinstance(metadata, dict) else str(metadata)
+        )
         db.commit()
         
         # Update progress
@@ -528,7 +534,7 @@ def run_mri_analysis_task(self, analysis_id: int, file_path: str):
         # Update database record
         analysis_record.status = "completed"
         analysis_record.analysis_completed_at = func.now()
-        analysis_record.results_json = json.dumps(analysis_results)
+        analysis_record.results_json = orjson.dumps(analysis_results, option=orjson.OPT_SERIALIZE_NUMPY).decode()
         analysis_record.overall_risk_level = overall_risk
         analysis_record.confidence_score = confidence_avg
         